@@ -0,0 +1,296 @@
+"""Approximate mode: sample estimates first, exact figures once computed.
+
+A ``StratifiedSample`` holds a simple random sample of order lines from every
+region x category x segment stratum (proportional allocation, with a floor so
+small strata are still represented). The Home KPIs and the Sales, Trends,
+Category, Location and Shipping summaries are estimated from it with the
+stratified estimator of a total, each page group being a domain:
+
+    total = sum_h N_h / n_h * sum(y_i in group)
+    var   = sum_h N_h^2 (1 - n_h / N_h) s_h^2 / n_h
+
+where s_h^2 is the variance within stratum h of y_i (0 outside the group).
+Estimates come back in the same shape as the exact summaries, plus a
+``<measure>_ci`` column (or key) with the half-width of a 95% confidence
+interval. Ratios (mean quantity, average order size) are estimated without
+an interval. Their cost depends on the sample size, not the row count.
+
+Distinct orders are counted by weighting each sampled line by one over the
+lines its order has in the selected categories, which assumes (as in the
+Superstore data) that an order's date, region and segment are the same on
+all its lines.
+
+``ApproximateBackend`` wraps a backend for one script run: it answers those
+summaries from the sample unless the exact result is already in the shared
+``ResultCache``, and hands the exact query to a ``Refiner`` thread, so the
+page can re-run with exact figures once they are ready.
+
+Drawing a sample is a pass over all rows. ``SampleKeeper`` draws it in the
+background when the backend loads, and again when orders are appended,
+serving the previous sample until the new one is ready (and exact figures
+until the first one is).
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cube import PERIOD_CODES, PERIOD_MONTHS, period_labels
+from data_store import MONTH_CODE, month_codes, plain_columns
+from result_cache import cache_key
+
+logger = logging.getLogger("dashboard.approx")
+
+STRATA = ["region", "category", "segment"]
+SAMPLE_DIMENSIONS = ["region", "category", "sub-category", "segment", "state", "ship_mode"]
+SAMPLE_COLUMNS = ["order_id", "order_date", MONTH_CODE, *SAMPLE_DIMENSIONS, "sales", "profit", "quantity"]
+DEFAULT_SAMPLE_ROWS = 50_000
+MIN_PER_STRATUM = 50
+Z_95 = 1.96
+
+
+def approximate_default():
+    return os.environ.get("DASHBOARD_APPROXIMATE", "").lower() in ("1", "true", "yes")
+
+
+def sample_rows_from_env():
+    return int(os.environ.get("DASHBOARD_SAMPLE_ROWS", DEFAULT_SAMPLE_ROWS))
+
+
+def allocate(population, size, minimum=MIN_PER_STRATUM):
+    """Rows to sample per stratum: proportional to ``population``, at least ``minimum``."""
+    population = np.asarray(population, dtype=np.int64)
+    take = np.round(size * population / max(population.sum(), 1)).astype(np.int64)
+    return np.minimum(np.maximum(take, minimum), population)
+
+
+class StratifiedSample:
+    """Sampled order lines with the population and sample size of their stratum."""
+
+    def __init__(self, rows, stratum, population, order_lines):
+        rows = rows.reset_index(drop=True)
+        rows = rows.astype({col: "category" for col in SAMPLE_DIMENSIONS})
+        if MONTH_CODE not in rows:
+            rows[MONTH_CODE] = month_codes(rows["order_date"])
+        for freq in ("Q", "Y"):
+            rows[PERIOD_CODES[freq]] = rows[MONTH_CODE] // PERIOD_MONTHS[freq]
+        self.rows = rows
+        self.stratum = np.asarray(stratum, dtype=np.int64)
+        self.population = np.asarray(population, dtype=np.float64)
+        self.sampled = np.bincount(self.stratum, minlength=len(self.population)).astype(np.float64)
+        # lines of each sampled row's order, per category (one column per category)
+        self.order_lines = order_lines.reset_index(drop=True)
+
+    @classmethod
+    def draw(cls, df, size=None, seed=0):
+        """Sample the in-memory orders ``df``."""
+        stratum = df.groupby(STRATA, observed=True, sort=False, dropna=False).ngroup().to_numpy()
+        population = np.bincount(stratum)
+        take = allocate(population, size or sample_rows_from_env())
+        # rank the rows of each stratum in random order and keep the first `take`
+        order = np.lexsort((np.random.default_rng(seed).random(len(df)), stratum))
+        starts = np.cumsum(population) - population
+        rank = np.empty(len(df), dtype=np.int64)
+        rank[order] = np.arange(len(df)) - np.repeat(starts, population)
+        keep = np.flatnonzero(rank < take[stratum])
+        rows = df[SAMPLE_COLUMNS].iloc[keep]
+        # lines per category of the sampled orders only, not of every order
+        lines = df[df["order_id"].isin(rows["order_id"].unique())]
+        counts = lines.groupby(["order_id", "category"], observed=True).size().unstack(fill_value=0)
+        return cls(rows, stratum[keep], population, counts.reindex(rows["order_id"]))
+
+    @property
+    def complete(self):
+        """True when every row was sampled, so estimates would be exact."""
+        return bool((self.sampled == self.population).all())
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _mask(self, filters):
+        rows = self.rows
+        mask = rows["order_date"].between(filters.start, filters.end).to_numpy()
+        for col, values in filters.selections().items():
+            mask = mask & rows[col].isin(values).to_numpy()
+        return mask
+
+    def estimate(self, filters, keys, measures):
+        """Estimated totals of ``measures`` (and of "lines") by ``keys``, with 95% CI half-widths."""
+        mask = self._mask(filters)
+        if keys:
+            # as in the exact group-bys, a row missing a key value is in no group
+            mask = mask & self.rows[keys].notna().all(axis=1).to_numpy()
+        rows = self.rows[mask]
+        values = {m: rows[m].to_numpy(dtype=np.float64) for m in measures if m != "orders"}
+        values["lines"] = np.ones(len(rows))
+        if "orders" in measures:
+            lines = self.order_lines.loc[mask, [c for c in self.order_lines.columns if c in filters.category]]
+            values["orders"] = 1.0 / np.maximum(lines.to_numpy().sum(axis=1), 1)
+        if keys:
+            groups = rows.groupby(keys, observed=True)
+            group, labels = groups.ngroup().to_numpy(), groups.size().index.to_frame(index=False)
+        else:
+            group, labels = np.zeros(len(rows), dtype=np.int64), pd.DataFrame(index=[0])
+        # sums per (group, stratum) cell, then the stratified total and variance per group
+        strata = len(self.population)
+        cell = group * strata + self.stratum[mask]
+        N, n = self.population, self.sampled
+        scale = np.divide(N ** 2 * (1 - n / N), n * (n - 1), out=np.zeros(strata), where=n > 1)
+        out = labels
+        for m, v in values.items():
+            total = np.bincount(cell, weights=v, minlength=len(labels) * strata).reshape(-1, strata)
+            squares = np.bincount(cell, weights=v * v, minlength=len(labels) * strata).reshape(-1, strata)
+            out[m] = (total * (N / n)).sum(axis=1)
+            # n_h - 1 times the within-stratum variance of y (0 outside the group)
+            spread = np.maximum(squares - total ** 2 / n, 0.0)
+            out[f"{m}_ci"] = Z_95 * np.sqrt((spread * scale).sum(axis=1))
+        return plain_columns(out)
+
+    # --- Page summaries, in the shape of the backend methods ---
+    def kpis(self, filters):
+        row = self.estimate(filters, [], ["sales", "profit", "quantity"]).iloc[0]
+        return {m: float(row[m]) for m in ("sales", "profit", "quantity", "sales_ci", "profit_ci", "quantity_ci")}
+
+    def _summary(self, filters, keys, measures):
+        summary = self.estimate(filters, keys, measures)
+        return summary[keys + [c for m in measures for c in (m, f"{m}_ci")]]
+
+    def sales_by(self, filters, keys, measures):
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        measures = [measures] if isinstance(measures, str) else list(measures)
+        if keys == ["order_period"]:
+            summary = self._summary(filters, [MONTH_CODE], measures)
+            summary[MONTH_CODE] = period_labels(summary[MONTH_CODE], "M")
+            return summary.rename(columns={MONTH_CODE: "order_period"})
+        return self._summary(filters, keys, measures)
+
+    def trends(self, filters, freq):
+        code = PERIOD_CODES[freq]
+        trends = self._summary(filters, [code, "category"], ["sales", "profit", "quantity"])
+        trends[code] = period_labels(trends[code], freq)
+        return trends.rename(columns={code: "period"})
+
+    def category_summary(self, filters):
+        summary = self.estimate(filters, ["category", "sub-category"], ["sales", "profit", "quantity", "orders"])
+        orders = summary["orders"].sum()
+        summary["avg_order_size"] = summary["quantity"] / orders if orders else np.nan
+        return summary[["category", "sub-category", "sales", "sales_ci", "profit", "profit_ci", "quantity",
+                        "quantity_ci", "avg_order_size"]]
+
+    def state_summary(self, filters):
+        return self._summary(filters, ["state"], ["sales", "profit"])
+
+    def shipping_summary(self, filters):
+        summary = self.estimate(filters, ["ship_mode"], ["sales", "quantity", "profit"])
+        summary["quantity"] = summary["quantity"] / summary["lines"]
+        summary = summary.rename(columns={"lines": "order_id", "lines_ci": "order_id_ci"})
+        return summary[["ship_mode", "order_id", "order_id_ci", "sales", "sales_ci", "quantity", "profit", "profit_ci"]]
+
+
+class SampleKeeper:
+    """The latest sample; a new data version is sampled in the background."""
+
+    def __init__(self, draw):
+        self.draw = draw  # () -> StratifiedSample of the current data
+        self.sample = None
+        self.version = None  # data version the sample was drawn for
+        self._redrawing = False
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sample")
+        self._lock = threading.Lock()
+
+    def start(self, version):
+        """Draw a sample for ``version`` in the background, unless it is drawn or being drawn."""
+        with self._lock:
+            if version != self.version and not self._redrawing:
+                self._redrawing = True
+                self._pool.submit(self._redraw, version)
+
+    def get(self, version):
+        """A sample for ``version``, the previous one while that is drawn, or None before the first is."""
+        self.start(version)
+        return self.sample
+
+    def _redraw(self, version):
+        try:
+            sample = self.draw()
+        except Exception:
+            logger.exception("redrawing the sample for version %s failed", version)
+            sample = None
+        with self._lock:
+            if sample is not None:
+                self.sample, self.version = sample, version
+            self._redrawing = False
+
+
+# --- Progressive refinement ---
+class Refiner:
+    """Computes exact results on background threads, at most once per cache key."""
+
+    def __init__(self, workers=2, keep=1024):
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="refine")
+        self._running = set()
+        self._finished = OrderedDict()  # recently finished keys
+        self._lock = threading.Lock()
+
+    def submit(self, key, compute):
+        with self._lock:
+            if key in self._running or key in self._finished:
+                return
+            self._running.add(key)
+        self._pool.submit(self._run, key, compute)
+
+    def _run(self, key, compute):
+        try:
+            compute()  # stores the result in the backend's ResultCache
+        except Exception:
+            # the page's own (synchronous) call will raise it again where it is shown
+            logger.exception("exact %s failed", key[0])
+        with self._lock:
+            self._running.discard(key)
+            self._finished[key] = None
+            while len(self._finished) > self.keep:
+                self._finished.popitem(last=False)
+
+    def finished(self, key):
+        with self._lock:
+            return key in self._finished
+
+    def pending(self, keys):
+        return [key for key in keys if not self.finished(key)]
+
+
+class ApproximateBackend:
+    """One script run's view of ``backend`` in approximate mode.
+
+    The approximable summaries return the sample estimate until the exact
+    result has been computed; everything else goes straight to ``backend``.
+    ``pending`` lists the cache keys of estimates served in this run.
+    """
+
+    APPROXIMATE = ("kpis", "sales_by", "trends", "category_summary", "state_summary", "shipping_summary")
+
+    def __init__(self, backend, sample, refiner):
+        self.backend = backend
+        self.sample = sample
+        self.refiner = refiner
+        self.pending = []
+
+    def __getattr__(self, name):
+        attr = getattr(self.backend, name)
+        if name not in self.APPROXIMATE or self.sample.complete:
+            return attr
+        return lambda filters, *args: self._progressive(name, attr, filters, *args)
+
+    def _progressive(self, name, exact, filters, *args):
+        key = cache_key(name, self.backend.version, (filters, *args))
+        # the key may also have been evicted (or been too large to cache) since it was refined
+        if key in self.backend.results or self.refiner.finished(key):
+            return exact(filters, *args)
+        self.refiner.submit(key, lambda: exact(filters, *args))
+        self.pending.append(key)
+        return getattr(self.sample, name)(filters, *args)
@@ -0,0 +1,154 @@
+"""Check the FilterIndex and the cube against plain boolean masks.
+
+    python -m benchmarks.check_filters [--rows 20000] [--trials 200]
+
+Builds a synthetic order frame with some missing dimension values and order
+dates, then, for random sidebar selections and date ranges, compares the
+index's row positions with a ``between`` & ``isin`` mask over the raw columns
+(on both the compact categorical frame and plain object columns), and the
+Home KPIs with the cube-backed Sales totals. Empty selections (a cleared
+multiselect, a date range without orders) must give empty summaries that
+still chart. A sample holding every row must estimate the approximate-mode
+summaries exactly, missing values included. Exits non-zero on a mismatch or
+an error.
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from approx import StratifiedSample
+from benchmarks.generate_data import OrderGenerator
+from chart_budget import line_chart
+from data_store import compact_orders, prepare_orders
+from filter_index import INDEXED_COLUMNS, FilterIndex
+from query_backend import Filters, PandasBackend
+
+
+def sample_frame(rows, seed=0):
+    df = prepare_orders(OrderGenerator(rows, seed=seed).chunk(0, rows))
+    rng = np.random.default_rng(seed)
+    for col in INDEXED_COLUMNS:
+        df.loc[rng.random(rows) < 0.02, col] = None
+    for col in ("state", "ship_mode", "sub-category"):
+        df.loc[rng.random(rows) < 0.01, col] = None
+    df.loc[rng.random(rows) < 0.01, "order_date"] = pd.NaT
+    return df
+
+
+def random_filters(df, rng):
+    selections = {}
+    for col in INDEXED_COLUMNS:
+        values = df[col].dropna().unique()
+        # every value (the default sidebar state) about half the time
+        keep = values if rng.random() < 0.5 else values[rng.random(len(values)) < 0.5]
+        selections[col] = list(keep)
+    lo, hi = df["order_date"].min(), df["order_date"].max()
+    start, end = sorted(lo + (hi - lo) * r for r in rng.random(2))
+    if rng.random() < 0.3:
+        start, end = lo, hi
+    # the date picker sends whole days
+    return Filters.make(selections["region"], selections["category"], selections["segment"], start.date(), end.date())
+
+
+def expected_positions(df, filters):
+    mask = df["order_date"].between(filters.start, filters.end)
+    for col, values in filters.selections().items():
+        mask &= df[col].isin(values)
+    return np.flatnonzero(mask.to_numpy())
+
+
+def empty_filters(df):
+    everything = {col: list(df[col].dropna().unique()) for col in INDEXED_COLUMNS}
+    lo, hi = df["order_date"].min(), df["order_date"].max()
+    cases = {}
+    for col in INDEXED_COLUMNS:
+        selections = {**everything, col: []}
+        cases[f"no {col}"] = Filters.make(selections["region"], selections["category"], selections["segment"], lo, hi)
+    before = lo - pd.Timedelta(days=30)
+    cases["no orders in range"] = Filters.make(*everything.values(), before, before + pd.Timedelta(days=7))
+    return cases
+
+
+def check_empty(df, sources):
+    """Errors raised by the page summaries and line charts of empty selections.
+
+    ``sources`` maps a name to a backend or a ``StratifiedSample``.
+    """
+    failures = []
+    for case, filters in empty_filters(df).items():
+        for name, source in sources.items():
+            try:
+                if source.kpis(filters)["sales"] != 0:
+                    failures.append(f"{name}, {case}: KPI sales not 0")
+                line_chart(source.trends(filters, "M"), "period", "sales", color="category")
+                line_chart(source.sales_by(filters, "order_period", "sales"), "order_period", "sales")
+                for summary in ("category_summary", "state_summary", "shipping_summary"):
+                    if len(getattr(source, summary)(filters)):
+                        failures.append(f"{name}, {case}: {summary} not empty")
+            except Exception as exc:
+                failures.append(f"{name}, {case}: {type(exc).__name__}: {exc}")
+    return failures
+
+
+def check_estimates(sample, backend, filters):
+    """Differences between the exact summaries and the estimates of a sample of every row."""
+    failures = []
+    summaries = {
+        "state_summary": ["state"],
+        "shipping_summary": ["ship_mode"],
+        "category_summary": ["category", "sub-category"],
+    }
+    for name, keys in summaries.items():
+        try:
+            exact = getattr(backend, name)(filters).sort_values(keys).reset_index(drop=True)
+            estimate = getattr(sample, name)(filters).sort_values(keys).reset_index(drop=True)
+        except Exception as exc:
+            failures.append(f"estimated {name}: {type(exc).__name__}: {exc}")
+            continue
+        if len(exact) != len(estimate) or not np.allclose(exact["sales"], estimate["sales"], rtol=1e-6):
+            failures.append(f"estimated {name}: {len(estimate)} groups differ from {len(exact)} exact ones")
+    return failures
+
+
+def check(rows, trials, seed=0):
+    df = sample_frame(rows, seed)
+    compact = compact_orders(df)
+    indexes = {"compact": FilterIndex(compact), "object": FilterIndex(df)}
+    backend = PandasBackend(df)
+    rng = np.random.default_rng(seed)
+    failures = []
+    for trial in range(trials):
+        filters = random_filters(df, rng)
+        expected = expected_positions(df, filters)
+        for name, index in indexes.items():
+            got = index.positions(filters.selections(), filters.start, filters.end)
+            if not np.array_equal(got, expected):
+                failures.append(f"trial {trial}: {name} index kept {len(got)} rows, mask {len(expected)}")
+        kpis = backend.kpis(filters)
+        by_region = backend.sales_by(filters, "region", "sales")["sales"].sum()
+        if not np.isclose(kpis["sales"], df["sales"].to_numpy()[expected].sum(), rtol=1e-6, atol=0.01):
+            failures.append(f"trial {trial}: KPI sales {kpis['sales']:.2f} differ from the mask")
+        if not np.isclose(kpis["sales"], by_region, rtol=1e-6, atol=0.01):
+            failures.append(f"trial {trial}: KPI sales {kpis['sales']:.2f} vs cube {by_region:.2f}")
+    # a sample of every row: its estimates must be the exact figures
+    sample = StratifiedSample.draw(compact, len(df))
+    for filters in [random_filters(df, rng) for _ in range(5)]:
+        failures += check_estimates(sample, backend, filters)
+    return failures + check_empty(df, {"exact": backend, "estimate": sample})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the filter index with boolean masks.")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    failures = check(args.rows, args.trials, args.seed)
+    for line in failures:
+        print(f"❌ {line}")
+    if not failures:
+        print(f"✅ {args.trials} random filters match the boolean masks; empty selections chart")
+    sys.exit(1 if failures else 0)
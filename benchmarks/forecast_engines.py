@@ -0,0 +1,70 @@
+"""Compare forecast engines on latency and accuracy.
+
+    python -m benchmarks.forecast_engines [--holdout 6] [--csv cleaned_superstore.csv]
+
+Every region/category/segment monthly sales series is split into a training
+part and the last ``--holdout`` months. Each engine fits the training parts and
+is scored on the held-out months (MAPE/RMSE). Every engine forecasts month
+starts, the dates it was trained on and the actuals carry, so the scores
+compare like with like. Prophet is skipped when it is not installed.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import CSV_PATH, PARQUET_DIR, load_orders
+from forecasting import FAST_METHODS, FORECAST_FILTERS, fast_forecast_batch, fit_prophet, forecast_frame, monthly_series
+
+
+def holdout_scores(test, forecast):
+    merged = test.merge(forecast[['ds', 'yhat']], on='ds', how='inner')
+    if merged.empty:
+        return np.nan, np.nan
+    err = merged['y'] - merged['yhat']
+    mape = (err.abs() / merged['y'].abs()).mean() * 100
+    rmse = np.sqrt((err ** 2).mean())
+    return mape, rmse
+
+
+def run(df, holdout):
+    series = [monthly_series(df, f, v) for f in FORECAST_FILTERS for v in df[f].dropna().unique()]
+    train = [ts.iloc[:-holdout] for ts in series]
+    test = [ts.iloc[-holdout:] for ts in series]
+
+    # the held-out months, at the month-start frequency of the training series
+    engines = {
+        name: (lambda tr, m=method: fast_forecast_batch(tr, holdout, m, freq="MS"))
+        for name, method in FAST_METHODS.items()
+    }
+    try:
+        import prophet  # noqa: F401
+        engines["Prophet"] = lambda tr: [forecast_frame(fit_prophet(ts), holdout, freq="MS") for ts in tr]
+    except ImportError:
+        print("prophet not installed, skipping")
+
+    rows = []
+    for name, engine in engines.items():
+        start = time.perf_counter()
+        forecasts = engine(train)
+        elapsed = time.perf_counter() - start
+        scores = [holdout_scores(t, fc) for t, fc in zip(test, forecasts)]
+        rows.append({
+            'engine': name,
+            'series': len(series),
+            'total_s': elapsed,
+            'per_series_ms': elapsed / len(series) * 1000,
+            'mape': np.nanmean([s[0] for s in scores]),
+            'rmse': np.nanmean([s[1] for s in scores]),
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark forecast engines.")
+    parser.add_argument("--holdout", type=int, default=6, help="months held out for scoring")
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--parquet", default=PARQUET_DIR)
+    args = parser.parse_args()
+    print(run(load_orders(args.csv, args.parquet), args.holdout).to_string(index=False))
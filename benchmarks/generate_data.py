@@ -0,0 +1,172 @@
+"""Generate synthetic Superstore-schema order data at benchmark scale.
+
+    python -m benchmarks.generate_data --rows 1000000 [--format parquet|csv]
+
+Cardinalities follow the Global Superstore dataset (about two lines per
+order, 13 regions, 3 categories / 17 sub-categories, 3 segments, 4 ship modes,
+~1,100 states) and grow with the row count for customers and products.
+Rows are generated and written in chunks, so 50M rows never sit in memory.
+"""
+import argparse
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from data_store import prepare_orders, remove_snapshot, write_parquet_chunk
+
+DATA_DIR = os.path.join("benchmarks", "data")
+SIZES = {"100k": 100_000, "1m": 1_000_000, "10m": 10_000_000, "50m": 50_000_000}
+
+REGIONS = [
+    "Central", "South", "EMEA", "North", "Africa", "Oceania", "West",
+    "Southeast Asia", "East", "North Asia", "Central Asia", "Canada", "Caribbean",
+]
+SUB_CATEGORIES = {
+    "Office Supplies": ["Binders", "Storage", "Art", "Paper", "Appliances", "Supplies", "Envelopes", "Fasteners", "Labels"],
+    "Technology": ["Phones", "Copiers", "Machines", "Accessories"],
+    "Furniture": ["Chairs", "Bookcases", "Tables", "Furnishings"],
+}
+SEGMENTS = (["Consumer", "Corporate", "Home Office"], [0.52, 0.30, 0.18])
+SHIP_MODES = (["Standard Class", "Second Class", "First Class", "Same Day"], [0.60, 0.20, 0.15, 0.05])
+US_STATES = [
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS", "KY",
+    "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND",
+    "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+]
+N_STATES = 1100
+DISCOUNTS = ([0.0, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7], [0.45, 0.12, 0.05, 0.15, 0.07, 0.06, 0.05, 0.03, 0.02])
+# Nov-Dec peak, as in the real data
+MONTH_WEIGHTS = np.array([5, 5, 7, 7, 8, 9, 8, 9, 10, 9, 11, 12], dtype=float)
+
+
+def cardinalities(rows):
+    scale = rows / 51_290
+    return {
+        "orders": max(1, rows // 2),
+        "customers": int(800 * max(scale, 1) ** 0.5),
+        "products": min(int(10_000 * max(scale, 1) ** 0.3), 100_000),
+    }
+
+
+class OrderGenerator:
+    def __init__(self, rows, start="2011-01-01", years=4, seed=0):
+        self.rows = rows
+        self.card = cardinalities(rows)
+        self.rng = np.random.default_rng(seed)
+        self.start = pd.Timestamp(start)
+        self.years = years
+
+        rng = self.rng
+        self.states = np.array(US_STATES + [f"State {i:04d}" for i in range(N_STATES - len(US_STATES))])
+        self.state_region = rng.choice(REGIONS, len(self.states))
+        self.state_region[: len(US_STATES)] = rng.choice(["Central", "South", "West", "East"], len(US_STATES))
+        # heavier traffic in the US states, as in the real data
+        weights = np.where(np.arange(len(self.states)) < len(US_STATES), 20.0, 1.0)
+        self.state_weights = weights / weights.sum()
+
+        pairs = [(c, s) for c, subs in SUB_CATEGORIES.items() for s in subs]
+        product_pair = rng.integers(0, len(pairs), self.card["products"])
+        self.product_category = np.array([pairs[i][0] for i in product_pair])
+        self.product_sub = np.array([pairs[i][1] for i in product_pair])
+        self.product_names = np.array([f"{pairs[p][1]} Item {i:06d}" for i, p in enumerate(product_pair)])
+        self.product_price = rng.lognormal(4.0, 1.2, self.card["products"])
+        self.product_margin = rng.normal(0.15, 0.1, self.card["products"])
+        # Zipf-like popularity
+        pop = 1.0 / np.arange(1, self.card["products"] + 1) ** 0.8
+        self.product_weights = pop / pop.sum()
+
+        self.customer_names = np.array([f"Customer {i:06d}" for i in range(self.card["customers"])])
+        self.customer_segment = rng.choice(SEGMENTS[0], self.card["customers"], p=SEGMENTS[1])
+
+    def _order_dates(self, order_ids):
+        # deterministic per order so every line of an order shares its date
+        rng = np.random.default_rng(order_ids)
+        year = rng.integers(0, self.years, len(order_ids))
+        month = rng.choice(12, len(order_ids), p=MONTH_WEIGHTS / MONTH_WEIGHTS.sum())
+        day = rng.integers(0, 28, len(order_ids))
+        base = np.datetime64(self.start.strftime("%Y-%m"), "M")
+        months = base + (year * 12 + month).astype("timedelta64[M]")
+        return months.astype("datetime64[D]") + day.astype("timedelta64[D]")
+
+    def chunk(self, offset, size):
+        rng = self.rng
+        row_id = np.arange(offset, offset + size)
+        order_num = row_id * self.card["orders"] // self.rows
+        order_rng = np.random.default_rng([1, int(order_num[0])])
+        n_orders = int(order_num[-1] - order_num[0]) + 1
+        order_customer = order_rng.integers(0, self.card["customers"], n_orders)
+        order_state = order_rng.choice(len(self.states), n_orders, p=self.state_weights)
+        order_ship = order_rng.choice(SHIP_MODES[0], n_orders, p=SHIP_MODES[1])
+        order_date = self._order_dates(np.arange(order_num[0], order_num[-1] + 1))
+        o = order_num - order_num[0]
+
+        product = rng.choice(self.card["products"], size, p=self.product_weights)
+        quantity = rng.integers(1, 15, size)
+        discount = rng.choice(DISCOUNTS[0], size, p=DISCOUNTS[1])
+        sales = np.round(self.product_price[product] * quantity * (1 - discount), 2)
+        profit = np.round(sales * (self.product_margin[product] - discount * 0.8 + rng.normal(0, 0.05, size)), 2)
+        customer = order_customer[o]
+        state = order_state[o]
+
+        return pd.DataFrame({
+            "order_id": np.char.add("ORD-", order_num.astype(str)),
+            "order_date": order_date[o],
+            "ship_mode": order_ship[o],
+            "customer_name": self.customer_names[customer],
+            "segment": self.customer_segment[customer],
+            "state": self.states[state],
+            "region": self.state_region[state],
+            "category": self.product_category[product],
+            "sub-category": self.product_sub[product],
+            "product_name": self.product_names[product],
+            "sales": sales,
+            "quantity": quantity,
+            "discount": discount,
+            "profit": profit,
+        })
+
+    def chunks(self, chunksize=1_000_000):
+        for offset in range(0, self.rows, chunksize):
+            yield self.chunk(offset, min(chunksize, self.rows - offset))
+
+
+def dataset_path(label, fmt="parquet", data_dir=DATA_DIR):
+    name = f"superstore_{label}"
+    return os.path.join(data_dir, name + (".csv" if fmt == "csv" else ""))
+
+
+def generate(rows, out, fmt="parquet", chunksize=1_000_000, years=None, seed=0):
+    years = years or (4 if rows <= 1_000_000 else 10)
+    gen = OrderGenerator(rows, years=years, seed=seed)
+    if os.path.isdir(out):
+        shutil.rmtree(out)
+    elif os.path.exists(out):
+        os.remove(out)
+    # a snapshot of the old data must not outlive it
+    remove_snapshot(out)
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    for i, chunk in enumerate(gen.chunks(chunksize)):
+        if fmt == "csv":
+            chunk.to_csv(out, mode="a", header=(i == 0), index=False)
+        else:
+            write_parquet_chunk(prepare_orders(chunk), out, i)
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic Superstore data.")
+    parser.add_argument("--size", action="append", choices=list(SIZES), help="named size; repeatable (default: all)")
+    parser.add_argument("--rows", type=int, help="explicit row count instead of --size")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--out-dir", default=DATA_DIR)
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    targets = {f"{args.rows}": args.rows} if args.rows else {k: SIZES[k] for k in (args.size or SIZES)}
+    for label, rows in targets.items():
+        out = dataset_path(label, args.format, args.out_dir)
+        generate(rows, out, args.format, args.chunksize, seed=args.seed)
+        print(f"✅ {rows:,} rows -> {out}")
@@ -0,0 +1,238 @@
+"""Benchmark the data work behind every dashboard page, without the UI.
+
+    python -m benchmarks.pages --size 100k --size 1m [--save-baseline | --check]
+
+For each dataset size this loads the data (generating it first if needed),
+applies a typical sidebar filter and runs each page's filtering, group-bys,
+pivots and forecast prep, plus a cold-cache export of one table in every
+download format. Wall time (median of ``--repeat`` runs)
+and peak traced memory are reported per page, for the pandas or DuckDB
+backend (``--backend``). ``--save-baseline`` stores the
+results in benchmarks/baseline.json; ``--check`` compares against it and exits
+non-zero on a regression.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import cached_property
+
+import pandas as pd
+
+from benchmarks.generate_data import SIZES, dataset_path, generate
+from chart_budget import bounded_heatmap
+from exports import EXPORT_FORMATS, ExportCache
+from query_backend import BACKENDS, Filters, discount_pivot, make_backend
+from search_index import TrigramIndex
+
+BASELINE_PATH = os.path.join("benchmarks", "baseline.json")
+
+
+# --- Page workloads (the data work each page in app.py asks its backend for) ---
+class Context:
+    def __init__(self, backend):
+        self.backend = backend
+        regions = sorted(backend.dimension_values("region"))
+        lo, hi = backend.date_bounds()
+        # a typical interaction: most regions, every category/segment, the last two years
+        self.filters = Filters.make(
+            regions[: max(1, len(regions) - 2)],
+            backend.dimension_values("category"),
+            backend.dimension_values("segment"),
+            (hi - pd.DateOffset(years=2)).date(),
+            hi.date(),
+        )
+
+    # Built on first use and then kept, like the app's cached name indexes
+    @cached_property
+    def customer_index(self):
+        return TrigramIndex(self.backend.dimension_values("customer_name"))
+
+    @cached_property
+    def product_index(self):
+        return TrigramIndex(self.backend.dimension_values("product_name"))
+
+
+def page_filter(ctx):
+    ctx.backend.filtered(ctx.filters)
+
+
+def page_home(ctx):
+    ctx.backend.kpis(ctx.filters)
+
+
+def page_sales(ctx):
+    b, f = ctx.backend, ctx.filters
+    b.sales_by(f, "region", "sales")
+    b.sales_by(f, "segment", "profit")
+    b.sales_by(f, "order_period", "sales")
+
+
+def page_customers(ctx):
+    customer_sales = ctx.backend.customer_summary(ctx.filters)
+    customer_sales["sales"].quantile(0.75)
+    customer_sales[ctx.customer_index.mask(customer_sales["customer_name"], "cust")]
+    customer_sales.nlargest(10, "profit")
+    customer_sales.nsmallest(10, "profit")
+
+
+def page_products(ctx):
+    b, f = ctx.backend, ctx.filters
+    cat = b.categories(f)[0]
+    b.sub_categories(f, cat)
+    b.avg_discount(f, cat)
+    discount_profit = b.product_discount_profit(f, cat)
+    bounded_heatmap(discount_pivot(discount_profit[ctx.product_index.mask(discount_profit["product_name"], "item")]))
+    all_products = b.product_summary(f, cat)
+    all_products = all_products[ctx.product_index.mask(all_products["product_name"], "item")]
+    all_products[(all_products["sales"] > 5000) & (all_products["profit"] < 0)]
+
+
+def page_trends(ctx):
+    for freq in ("M", "Q", "Y"):
+        trends = ctx.backend.trends(ctx.filters, freq)
+
+
+def page_category(ctx):
+    cat_data = ctx.backend.category_summary(ctx.filters)
+    cat_data["profit_margin"] = (cat_data["profit"] / cat_data["sales"]) * 100
+
+
+def page_location(ctx):
+    loc_summary = ctx.backend.state_summary(ctx.filters)
+    loc_summary["text"] = loc_summary["state"] + "<br>Sales: $" + loc_summary["sales"].round().astype(str)
+
+
+def page_shipping(ctx):
+    summary = ctx.backend.shipping_summary(ctx.filters)
+    summary["reorder_rate"] = summary["order_id"] / summary["quantity"]
+
+
+def page_forecast(ctx):
+    value = ctx.backend.dimension_values("region")[0]
+    ctx.backend.monthly_series("region", value)
+    ctx.backend.monthly_series("region", value, measure="profit")
+
+
+def page_export(ctx):
+    # what a Download click costs on a cold cache; page renders no longer export
+    customer_sales = ctx.backend.customer_summary(ctx.filters)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ExportCache(tmp)
+        for fmt in EXPORT_FORMATS:
+            cache.export("customers", ctx.filters, fmt, customer_sales)
+
+
+PAGES = {
+    "filter": page_filter,
+    "home": page_home,
+    "sales": page_sales,
+    "customers": page_customers,
+    "products": page_products,
+    "trends": page_trends,
+    "category": page_category,
+    "location": page_location,
+    "shipping": page_shipping,
+    "forecast": page_forecast,
+    "export": page_export,
+}
+
+
+# --- Measurement ---
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"wall_s": statistics.median(times), "peak_mb": peak / 1e6}
+
+
+def run_size(label, repeat=3, backend="pandas"):
+    path = dataset_path(label)
+    if not os.path.isdir(path):
+        print(f"  generating {label} dataset -> {path}")
+        generate(SIZES[label], path)
+
+    results = {}
+    holder = {}
+
+    def load():
+        holder["ctx"] = Context(make_backend(backend, parquet_dir=path))
+
+    results["load"] = measure(load, 1)
+    ctx = holder["ctx"]
+    for name, fn in PAGES.items():
+        if name == "filter" and backend != "pandas":
+            continue  # filters are pushed into every DuckDB query
+        results[name] = measure(lambda: (ctx.backend.clear_cache(), fn(ctx)), repeat)
+    return results
+
+
+def compare(current, baseline, tolerance, min_seconds=0.005):
+    regressions = []
+    for label, pages in current.items():
+        for page, stats in pages.items():
+            base = baseline.get(label, {}).get(page)
+            if base is None:
+                continue
+            if stats["wall_s"] > base["wall_s"] * (1 + tolerance) and stats["wall_s"] - base["wall_s"] > min_seconds:
+                regressions.append(f"{label}/{page}: {base['wall_s']:.3f}s -> {stats['wall_s']:.3f}s")
+    return regressions
+
+
+def report(results):
+    rows = [
+        {"size": label, "page": page, "wall_ms": stats["wall_s"] * 1000, "peak_mb": stats["peak_mb"]}
+        for label, pages in results.items()
+        for page, stats in pages.items()
+    ]
+    return pd.DataFrame(rows).to_string(index=False, float_format=lambda x: f"{x:,.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dashboard page data work.")
+    parser.add_argument("--size", action="append", choices=list(SIZES), help="repeatable (default: 100k)")
+    parser.add_argument("--backend", choices=BACKENDS, default="pandas")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="fail if slower than the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown for --check")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for label in args.size or ["100k"]:
+        print(f"Benchmarking {label} ...")
+        # baselines are kept per backend: "100k" for pandas, "100k/duckdb" otherwise
+        key = label if args.backend == "pandas" else f"{label}/{args.backend}"
+        results[key] = run_size(label, args.repeat, args.backend)
+    print(report(results))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"✅ Baseline saved to {args.baseline}")
+    if args.check:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"❌ {line}")
+        sys.exit(1 if regressions else 0)
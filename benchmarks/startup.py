@@ -0,0 +1,62 @@
+"""Cold-start benchmark: time to first paint of the Home page.
+
+    python -m benchmarks.startup --repeat 5
+    python -m benchmarks.startup --app /path/to/other/checkout/app.py   # compare revisions
+    python -m benchmarks.startup --cwd /path/to/data                     # where the CSV / Parquet live
+
+Each run starts a fresh interpreter and executes the app script once with
+Streamlit's AppTest (Home is the default page), so the wall time covers
+interpreter start, imports, data load and the first render, without a
+browser. The app runs in ``--cwd`` (default: here), which must hold the
+data as for ``streamlit run``. The Home counters animate for a fixed ~1.2 s of that.
+The heavy modules imported by the end of the run are listed as well.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = [
+    "prophet", "cmdstanpy", "sklearn", "seaborn", "matplotlib", "plotly.express", "streamlit_lottie",
+]
+
+CHILD = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=600)
+at.run()
+print(json.dumps({{
+    "errors": [str(e.value) for e in at.exception],
+    "modules": [m for m in {modules!r} if m in sys.modules],
+}}))
+"""
+
+
+def cold_start(app, cwd=None):
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(app)))
+    code = CHILD.format(app=os.path.abspath(app), modules=HEAVY_MODULES)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, cwd=cwd, check=True)
+    seconds = time.perf_counter() - start
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    if result["errors"]:
+        raise RuntimeError(f"{app} raised: {result['errors'][0]}")
+    return seconds, result["modules"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time a cold start of the dashboard's Home page.")
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--cwd", default=None, help="directory holding the data (default: current)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    times = []
+    for _ in range(args.repeat):
+        seconds, modules = cold_start(args.app, args.cwd)
+        times.append(seconds)
+    print(f"{args.app}: median {statistics.median(times):.2f}s, min {min(times):.2f}s over {args.repeat} cold starts")
+    print(f"heavy modules loaded: {', '.join(modules) or 'none'}")
@@ -0,0 +1,120 @@
+"""Keeps the figures sent to the browser within a payload budget.
+
+Every Plotly figure is serialised to JSON and shipped to the browser on each
+rerun, so its size grows with the number of points and heatmap cells:
+
+- line charts are downsampled with LTTB (largest triangle three buckets) to
+  at most ``MAX_LINE_POINTS`` points per trace, which keeps the peaks and
+  troughs a plain stride would drop;
+- traces with more than ``WEBGL_POINTS`` points are drawn with WebGL
+  (``scattergl``) instead of SVG;
+- heatmaps keep the ``HEATMAP_ROWS`` rows with the largest absolute total and
+  fold the rest into one "Other" row (their average, so it stays on the same
+  colour scale), and bin columns past ``HEATMAP_COLS``.
+"""
+import numpy as np
+import pandas as pd
+
+MAX_LINE_POINTS = 1500
+WEBGL_POINTS = 1000
+HEATMAP_ROWS = 40
+HEATMAP_COLS = 20
+
+
+# --- Time series ---
+def lttb(x, y, n_out):
+    """Indices of the ``n_out`` points LTTB keeps from the series ``x``, ``y``."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # n_out - 2 buckets between the first and the last point, which are always kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = x[hi:edges[i + 2]].mean(), y[hi:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def _positions(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float)
+    # labels such as "2014-03" are evenly spaced once sorted
+    return np.arange(len(values))
+
+
+def downsample(df, x, y, max_points=MAX_LINE_POINTS, group=None):
+    """Rows of ``df`` reduced to at most ``max_points`` per ``group`` trace."""
+    if df.empty:
+        return df  # an empty selection draws an empty chart
+    if group is not None:
+        if df.groupby(group, observed=True).size().max() <= max_points:
+            return df
+        return pd.concat(
+            downsample(part, x, y, max_points) for _, part in df.groupby(group, sort=False, observed=True)
+        )
+    if len(df) <= max_points:
+        return df
+    df = df.sort_values(x)
+    return df.iloc[lttb(_positions(df[x]), df[y].to_numpy(), max_points)]
+
+
+def render_mode(n_points, threshold=WEBGL_POINTS):
+    return "webgl" if n_points > threshold else "svg"
+
+
+def line_chart(df, x, y, color=None, max_points=MAX_LINE_POINTS, **kwargs):
+    """``px.line`` over the downsampled frame, switching to WebGL for long traces."""
+    import plotly.express as px
+
+    df = downsample(df, x, y, max_points, group=color)
+    longest = df.groupby(color, observed=True).size().max() if color is not None and len(df) else len(df)
+    return px.line(df, x=x, y=y, color=color, render_mode=render_mode(longest), **kwargs)
+
+
+def add_line(fig, df, x, y, name, max_points=MAX_LINE_POINTS):
+    """Add ``df`` as a downsampled line trace to an existing figure."""
+    import plotly.graph_objects as go
+
+    df = downsample(df, x, y, max_points)
+    trace = go.Scattergl if render_mode(len(df)) == "webgl" else go.Scatter
+    fig.add_trace(trace(x=df[x], y=df[y], mode="lines", name=name))
+    return fig
+
+
+# --- Heatmaps ---
+def top_rows(matrix, n=HEATMAP_ROWS, other="Other"):
+    """Keep the ``n`` rows with the largest absolute total; average the rest into one row."""
+    if len(matrix) <= n:
+        return matrix
+    order = matrix.abs().sum(axis=1).sort_values(ascending=False).index
+    rest = matrix.loc[order[n:]]
+    folded = rest.mean().to_frame(f"{other} (avg of {len(rest):,})").T
+    return pd.concat([matrix.loc[order[:n]], folded])
+
+
+def bin_columns(matrix, n=HEATMAP_COLS):
+    """Sum numeric columns into at most ``n`` equal-width bins."""
+    if len(matrix.columns) <= n:
+        return matrix
+    bins = pd.cut(np.asarray(matrix.columns, dtype=float), n)
+    binned = matrix.T.groupby(bins, observed=True).sum().T
+    binned.columns = binned.columns.astype(str)
+    return binned
+
+
+def bounded_heatmap(matrix, rows=HEATMAP_ROWS, cols=HEATMAP_COLS):
+    return top_rows(bin_columns(matrix, cols), rows)
+
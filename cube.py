@@ -0,0 +1,167 @@
+"""Pre-aggregated order cube for the page summaries.
+
+Sums and line counts are kept per month x region x category x sub-category x
+segment x state x ship_mode. The page group-bys (Sales, Trends, Category,
+Location, Shipping) all roll up from these cells, so their cost depends on the
+number of cells rather than the number of order lines.
+
+The sidebar date range is day-precise, so months only partly inside it are
+aggregated from their raw rows (found through the FilterIndex) and added to
+the cube cells of the fully covered months. Non-additive measures are derived
+from additive ones where possible (mean quantity = quantity / lines); distinct
+order counts are taken from the filtered rows.
+
+Rows come in the compact form of ``data_store.compact_orders``: months are
+integer codes, and each cell also carries its quarter and year code, so the
+Trends page groups integers and only formats the labels of the result.
+
+New order lines are added with ``append``: their cells are kept as a further
+part of the cube, next to their rows (a further segment for the partial-month
+lookups). A query filters every part and concatenates only the matching
+cells; all summaries are sums, so keys repeated across parts are harmless.
+``fold_appended`` merges the appended parts into one, leaving the first
+(which may be memory-mapped) as it is.
+Parts share their categorical dtypes, so that concatenation never re-codes;
+earlier parts are only re-coded when an append brings a new dimension value.
+"""
+import numpy as np
+import pandas as pd
+
+from data_store import MONTH_CODE, concat_compact, plain_columns
+
+CUBE_KEYS = [MONTH_CODE, "region", "category", "sub-category", "segment", "state", "ship_mode"]
+CUBE_MEASURES = ["sales", "profit", "quantity"]
+# cube column holding the period codes of each frequency, and months per period
+PERIOD_CODES = {"M": MONTH_CODE, "Q": "quarter_code", "Y": "year_code"}
+PERIOD_MONTHS = {"M": 1, "Q": 3, "Y": 12}
+
+
+def aggregate_cells(rows):
+    groups = rows.groupby(CUBE_KEYS, dropna=False, sort=False, observed=True)
+    # rows hold int16 quantities; the cells are summed again, so keep them wide
+    cells = groups[CUBE_MEASURES].sum().astype({"sales": "float64", "profit": "float64", "quantity": "int64"})
+    cells["lines"] = groups.size()
+    cells = cells.reset_index()
+    for freq in ("Q", "Y"):
+        cells[PERIOD_CODES[freq]] = cells[MONTH_CODE] // PERIOD_MONTHS[freq]
+    return cells
+
+
+def period_labels(codes, freq):
+    """"2014-03", "2014Q1" or "2014" labels of period ordinals."""
+    return pd.PeriodIndex.from_ordinals(np.asarray(codes), freq=freq).astype(str)
+
+
+class OrderCube:
+    def __init__(self, df, filter_index):
+        self.segments = []  # (rows, FilterIndex) pairs
+        self.cell_parts = []  # cube cells of each segment
+        self.min_date = self.max_date = None
+        self.append(df, filter_index)
+
+    def append(self, df, filter_index):
+        """Add order lines; costs time in proportion to ``df``, not the history."""
+        self.segments.append((df, filter_index))
+        cells = self._share_categories(aggregate_cells(df))  # may replace self.cell_parts
+        self.cell_parts.append(cells)
+        dates = filter_index.sorted_dates
+        if len(dates):
+            lo, hi = pd.Timestamp(dates[0]), pd.Timestamp(dates[-1])
+            self.min_date = lo if self.min_date is None else min(self.min_date, lo)
+            self.max_date = hi if self.max_date is None else max(self.max_date, hi)
+
+    def fold_appended(self, df, filter_index):
+        """Replace every appended part with one holding all their rows, ``df``; the first part is kept."""
+        self.segments = self.segments[:1] + [(df, filter_index)]
+        self.cell_parts = self.cell_parts[:1]
+        cells = self._share_categories(aggregate_cells(df))  # may replace self.cell_parts
+        self.cell_parts = self.cell_parts + [cells]
+
+    def _share_categories(self, cells):
+        """``cells`` recoded to the parts' categories, widening those for new values."""
+        if not self.cell_parts:
+            return cells
+        base = self.cell_parts[0]
+        for col in CUBE_KEYS:
+            if not isinstance(cells[col].dtype, pd.CategoricalDtype):
+                continue
+            known = base[col].cat.categories
+            merged = known.union(cells[col].cat.categories)
+            if not merged.equals(known):
+                self.cell_parts = [part.assign(**{col: part[col].cat.set_categories(merged)}) for part in self.cell_parts]
+            cells[col] = cells[col].cat.set_categories(merged)
+        return cells
+
+    def _clamp(self, start, end):
+        # a bound beyond the data also covers the rest of the data's first/last month
+        if start <= self.min_date:
+            start = min(start, self.min_date.to_period("M").start_time)
+        if end >= self.max_date:
+            end = max(end, self.max_date.to_period("M").end_time)
+        return start, end
+
+    def _full_months(self, start, end):
+        """First and last month wholly inside [start, end], or None."""
+        first = start.to_period("M")
+        if start > first.start_time:
+            first += 1
+        last = end.to_period("M")
+        if end < last.end_time:
+            last -= 1
+        return (first, last) if first <= last else None
+
+    def cells(self, selections, start, end):
+        """Cube cells for the sidebar selections and date range."""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if self.min_date is None or start > end:
+            return self.cell_parts[0].iloc[:0]
+        start, end = self._clamp(start, end)
+        months = self._full_months(start, end)
+        if months is None:
+            return self._raw_cells(selections, [(start, end)])
+
+        first, last = months
+        parts = []
+        for cube in self.cell_parts:
+            keep = cube[MONTH_CODE].between(first.ordinal, last.ordinal).to_numpy()
+            for col, values in selections.items():
+                keep = keep & cube[col].isin(values).to_numpy()
+            parts.append(cube[keep])
+        edges = []
+        if start < first.start_time:
+            edges.append((start, first.start_time - pd.Timedelta(1, "ns")))
+        if end > last.end_time:
+            edges.append((last.end_time + pd.Timedelta(1, "ns"), end))
+        if edges:
+            parts.append(self._raw_cells(selections, edges))
+        return parts[0] if len(parts) == 1 else concat_compact(parts)
+
+    def _raw_cells(self, selections, ranges):
+        rows = []
+        for df, filter_index in self.segments:
+            positions = np.concatenate([filter_index.positions(selections, lo, hi) for lo, hi in ranges])
+            rows.append(df.iloc[positions])
+        return aggregate_cells(concat_compact(rows) if len(rows) > 1 else rows[0])
+
+
+# --- Page summaries ---
+def sum_by(cells, keys, measures):
+    """Sum ``measures`` by ``keys``; the key "order_period" gives "YYYY-MM" months."""
+    if keys == "order_period":
+        summary = cells.groupby(MONTH_CODE)[measures].sum().reset_index()
+        summary[MONTH_CODE] = period_labels(summary[MONTH_CODE], "M")
+        return summary.rename(columns={MONTH_CODE: "order_period"})
+    return plain_columns(cells.groupby(keys, observed=True)[measures].sum().reset_index())
+
+
+def trends_by_period(cells, freq):
+    code = PERIOD_CODES[freq]
+    trends = plain_columns(cells.groupby([code, "category"], observed=True)[["sales", "profit", "quantity"]].sum().reset_index())
+    trends[code] = period_labels(trends[code], freq)
+    return trends.rename(columns={code: "period"})
+
+
+def summarize_shipping(cells):
+    summary = cells.groupby("ship_mode", observed=True)[["lines", "sales", "quantity", "profit"]].sum()
+    summary["quantity"] = summary["quantity"] / summary["lines"]
+    return plain_columns(summary.rename(columns={"lines": "order_id"}).reset_index())
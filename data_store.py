@@ -0,0 +1,365 @@
+"""Storage helpers for the order data: CSV fallback and partitioned Parquet.
+
+Run ``python data_store.py`` once to convert ``cleaned_superstore.csv`` into a
+Parquet dataset partitioned by order year. ``load_orders`` reads the Parquet
+dataset when it exists and falls back to the CSV otherwise.
+
+In memory the pandas backend keeps a compact copy (``compact_orders``):
+categorical dimensions, an integer month code instead of the
+``order_period`` string and downcast measures. ``python data_store.py
+--memory-report`` compares it with the frame as loaded.
+
+``python data_store.py --arrow`` writes that compact frame once to an Arrow
+IPC file next to the dataset (``data/superstore_parquet.arrow``). When it exists, every server process
+memory-maps it read-only instead of loading the dataset: columns are
+zero-copy views of the mapped file, so processes on one host share the same
+page-cache pages and an extra worker adds only its indexes and caches. The
+snapshot records the size and mtime of the part files it holds and is ignored
+once any of them changes; converting the CSV again deletes it.
+
+New orders are appended with ``python data_store.py --append delta.csv``: the
+delta becomes new part files in the dataset, which running servers pick up
+without reloading the history (see ``DatasetWatcher``).
+"""
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger("dashboard.data")
+
+CSV_PATH = "cleaned_superstore.csv"
+PARQUET_DIR = os.path.join("data", "superstore_parquet")
+
+# --- Schema ---
+# Only the columns the dashboard pages read, with their final dtypes.
+DIMENSION_COLUMNS = [
+    "order_id", "ship_mode", "customer_name", "segment", "state",
+    "region", "category", "sub-category", "product_name",
+]
+MEASURE_DTYPES = {
+    "sales": "float64",
+    "quantity": "int64",
+    "discount": "float64",
+    "profit": "float64",
+}
+ORDER_COLUMNS = ["order_date"] + DIMENSION_COLUMNS + list(MEASURE_DTYPES)
+DERIVED_COLUMNS = ["order_period"]
+
+# In-memory (compact) dtypes; every sum is taken in 64 bits (``wide_measures``).
+# Sales and profit stay float64: float32 holds line amounts to only ~7 digits,
+# so per-customer/product totals would be off by cents.
+COMPACT_MEASURE_DTYPES = {
+    "sales": "float64",
+    "quantity": "int16",
+    "discount": "float32",
+    "profit": "float64",
+}
+# Period ordinals (months since 1970-01), like pd.Period("2014-03").ordinal
+MONTH_CODE = "month_code"
+NO_MONTH = np.iinfo(np.int16).min  # rows without an order date
+
+
+def prepare_orders(df):
+    """Set dtypes and add the derived columns the pages expect."""
+    df = df.astype(MEASURE_DTYPES)
+    df["order_date"] = pd.to_datetime(df["order_date"])
+    df["order_period"] = df["order_date"].dt.to_period("M").astype(str)
+    return df
+
+
+def read_csv_orders(csv_path=CSV_PATH, chunksize=None):
+    return pd.read_csv(
+        csv_path,
+        usecols=ORDER_COLUMNS,
+        dtype=MEASURE_DTYPES,
+        parse_dates=["order_date"],
+        chunksize=chunksize,
+    )
+
+
+# --- Conversion ---
+def convert_csv_to_parquet(csv_path=CSV_PATH, out_dir=PARQUET_DIR, chunksize=1_000_000):
+    """Write the CSV as a Parquet dataset partitioned by ``order_year``.
+
+    The CSV is read in chunks so the conversion never holds the full history
+    in memory. Any existing dataset at ``out_dir`` is replaced, and its Arrow
+    snapshot deleted.
+    """
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    remove_snapshot(out_dir)
+    rows = 0
+    for i, chunk in enumerate(read_csv_orders(csv_path, chunksize=chunksize)):
+        write_parquet_chunk(prepare_orders(chunk), out_dir, i)
+        rows += len(chunk)
+    return rows
+
+
+def write_parquet_chunk(chunk, out_dir, part, prefix="part"):
+    """Append prepared order rows to the dataset as part ``part``."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    chunk = chunk[ORDER_COLUMNS + DERIVED_COLUMNS].assign(order_year=chunk["order_date"].dt.year)
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+    name = f"{prefix}-{part:05d}" if isinstance(part, int) else f"{prefix}-{part}"
+    pq.write_to_dataset(
+        table,
+        out_dir,
+        partition_cols=["order_year"],
+        basename_template=f"{name}-{{i}}.parquet",
+    )
+
+
+# --- Compact in-memory frame ---
+def month_codes(dates):
+    """int16 month ordinals of ``dates``; ``NO_MONTH`` where the date is missing."""
+    codes = (dates.dt.year - 1970) * 12 + dates.dt.month - 1
+    return codes.fillna(NO_MONTH).astype("int16")
+
+
+def order_keys(order_ids):
+    """64-bit hashes of order IDs; equal IDs hash equal in every segment."""
+    return pd.util.hash_pandas_object(order_ids, index=False).to_numpy()
+
+
+def compact_orders(df):
+    """Categorical dimensions, integer month codes and downcast measures.
+
+    Order IDs are only counted, never shown, so they are kept as 64-bit
+    hashes rather than a category of (nearly) unique strings.
+    Idempotent, so it can be applied again to a concatenation of compact
+    frames whose categoricals had to fall back to strings.
+    """
+    df = df.drop(columns=[c for c in DERIVED_COLUMNS if c in df])
+    columns = {col: df[col].astype("category") for col in DIMENSION_COLUMNS if col != "order_id"}
+    if df["order_id"].dtype != np.uint64:
+        columns["order_id"] = order_keys(df["order_id"])
+    columns.update({col: df[col].astype(dtype) for col, dtype in COMPACT_MEASURE_DTYPES.items()})
+    if MONTH_CODE not in df:
+        columns[MONTH_CODE] = month_codes(df["order_date"])
+    return df.assign(**columns)
+
+
+def wide_measures(df):
+    """``df`` with its compact measures widened back to the loaded dtypes, for sums and means.
+
+    Accumulating int16/float32 overflows or drifts with the size of the
+    total; widen the (filtered) rows before any group-by instead.
+    """
+    return df.astype({col: dtype for col, dtype in MEASURE_DTYPES.items() if col in df})
+
+
+def concat_compact(frames):
+    """``pd.concat`` of compact frames that keeps the dimensions categorical."""
+    out = pd.concat(frames, ignore_index=True)
+    for col in out.columns:
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype) and not isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = union_categoricals([f[col] for f in frames], sort_categories=True)
+    return out
+
+
+def plain_columns(summary):
+    """Turn categorical columns of a (small) summary table back into values."""
+    categorical = [col for col in summary.columns if isinstance(summary[col].dtype, pd.CategoricalDtype)]
+    return summary.astype({col: summary[col].cat.categories.dtype for col in categorical})
+
+
+def memory_report(loaded, compact):
+    """Per-column and total MB of the frame as loaded vs. its compact form."""
+    before = loaded.memory_usage(deep=True, index=False) / 2**20
+    after = compact.memory_usage(deep=True, index=False) / 2**20
+    report = pd.DataFrame({"loaded_mb": before, "compact_mb": after}).fillna(0)
+    report.loc["total"] = report.sum()
+    report["ratio"] = report["loaded_mb"] / report["compact_mb"].replace(0, np.nan)
+    return report.round(2)
+
+
+# --- Incremental append ---
+def read_delta(path):
+    """Read a CSV or Parquet file of new order lines, prepared like the history."""
+    if path.endswith(".parquet"):
+        return prepare_orders(pd.read_parquet(path, columns=ORDER_COLUMNS))
+    return prepare_orders(read_csv_orders(path))
+
+
+def append_delta(delta_path, parquet_dir=PARQUET_DIR):
+    """Add the rows of ``delta_path`` to the dataset as new part files.
+
+    Files are written to a staging directory first and then moved into their
+    partitions, so readers never see a half-written file.
+    """
+    if not os.path.isdir(parquet_dir):
+        raise FileNotFoundError(f"{parquet_dir} not found; convert the CSV first")
+    delta = read_delta(delta_path)
+    staging = parquet_dir.rstrip(os.sep) + ".staging"
+    shutil.rmtree(staging, ignore_errors=True)
+    write_parquet_chunk(delta, staging, f"{time.time_ns()}-{os.getpid()}", prefix="delta")
+    for path in dataset_files(staging):
+        target = os.path.join(parquet_dir, os.path.relpath(path, staging))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+    shutil.rmtree(staging, ignore_errors=True)
+    return len(delta)
+
+
+# --- Loading ---
+def dataset_files(parquet_dir):
+    return sorted(glob.glob(os.path.join(parquet_dir, "**", "*.parquet"), recursive=True))
+
+
+def read_parquet_files(files):
+    import pyarrow.dataset as ds
+
+    return ds.dataset(files, format="parquet").to_table(columns=ORDER_COLUMNS + DERIVED_COLUMNS).to_pandas()
+
+
+def file_stamps(paths):
+    """Size and mtime of each file, by absolute path: what a frame was read from."""
+    stamps = {}
+    for path in paths:
+        stat = os.stat(path)
+        stamps[os.path.abspath(path)] = (stat.st_size, stat.st_mtime_ns)
+    return stamps
+
+
+def dataset_id(stamps):
+    """Digest of ``file_stamps``; the same for the same files across restarts and processes."""
+    raw = json.dumps(sorted(stamps.items()))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def load_orders_with_files(csv_path=CSV_PATH, parquet_dir=PARQUET_DIR, snapshot=True):
+    """Like ``load_orders``, also returning the Parquet files that were read.
+
+    If the dataset has an up-to-date Arrow snapshot (and ``snapshot`` is set),
+    the frame is the mapped, compact snapshot and the files are those it was
+    written from.
+    """
+    if snapshot and os.path.exists(snapshot_path(parquet_dir)):
+        mapped = read_arrow_snapshot(parquet_dir)
+        if mapped is not None:
+            return mapped
+        logger.warning("%s is out of date; loading %s instead (rerun `python data_store.py --arrow`)",
+                       snapshot_path(parquet_dir), parquet_dir)
+    if os.path.isdir(parquet_dir):
+        files = dataset_files(parquet_dir)
+        return read_parquet_files(files), files
+    return prepare_orders(read_csv_orders(csv_path)), []
+
+
+def load_orders(csv_path=CSV_PATH, parquet_dir=PARQUET_DIR):
+    """Load the dashboard columns, preferring the Parquet dataset."""
+    return load_orders_with_files(csv_path, parquet_dir, snapshot=False)[0]
+
+
+# --- Shared Arrow snapshot ---
+def snapshot_path(parquet_dir=PARQUET_DIR):
+    return parquet_dir.rstrip(os.sep) + ".arrow"
+
+
+def remove_snapshot(parquet_dir=PARQUET_DIR):
+    try:
+        os.remove(snapshot_path(parquet_dir))
+    except FileNotFoundError:
+        pass
+
+
+def write_arrow_snapshot(csv_path=CSV_PATH, parquet_dir=PARQUET_DIR):
+    """Write the compact orders to an uncompressed Arrow IPC file for memory-mapping."""
+    import pyarrow as pa
+
+    df, files = load_orders_with_files(csv_path, parquet_dir, snapshot=False)
+    path = snapshot_path(parquet_dir)
+    # one chunk per column, so each maps to a single contiguous buffer
+    table = pa.Table.from_pandas(compact_orders(df), preserve_index=False).combine_chunks()
+    # remember the part files it holds (later ones are read as appended segments)
+    # and their size and mtime, to notice when they are rewritten
+    parts = {os.path.relpath(f, parquet_dir): stamp for f, stamp in zip(files, file_stamps(files).values())}
+    table = table.replace_schema_metadata({**table.schema.metadata, b"dashboard_parts": json.dumps(parts).encode()})
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    # running servers keep the old file's pages mapped until they restart
+    os.replace(tmp, path)
+    return table.num_rows
+
+
+def read_arrow_snapshot(parquet_dir=PARQUET_DIR):
+    """Map the snapshot read-only; returns the compact orders and the part files they hold.
+
+    Returns None if any of those files was removed or rewritten since the
+    snapshot was written (or it predates the recorded sizes and mtimes).
+    """
+    import pyarrow as pa
+
+    reader = pa.ipc.open_file(pa.memory_map(snapshot_path(parquet_dir), "r"))
+    parts = json.loads(reader.schema.metadata.get(b"dashboard_parts", b"[]"))
+    if not isinstance(parts, dict):
+        return None
+    files = [os.path.join(parquet_dir, part) for part in parts]
+    try:
+        current = list(file_stamps(files).values())
+    except FileNotFoundError:
+        return None
+    if current != [tuple(stamp) for stamp in parts.values()]:
+        return None
+    # split_blocks keeps each column a view of its mapped buffer instead of consolidating
+    df = reader.read_all().to_pandas(split_blocks=True)
+    return df, files
+
+
+class DatasetWatcher:
+    """Finds part files added to the Parquet dataset since the last check.
+
+    Checks are throttled to one directory listing per ``interval`` seconds.
+    """
+
+    def __init__(self, parquet_dir, seen=(), interval=5.0):
+        self.parquet_dir = parquet_dir
+        self.seen = set(seen)
+        self.interval = interval
+        self._checked = time.monotonic()
+
+    def new_files(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked < self.interval:
+            return []
+        self._checked = now
+        if not os.path.isdir(self.parquet_dir):
+            return []
+        files = [f for f in dataset_files(self.parquet_dir) if f not in self.seen]
+        self.seen.update(files)
+        return files
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the Superstore CSV to partitioned Parquet.")
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--out", default=PARQUET_DIR)
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    parser.add_argument("--append", metavar="DELTA", help="append a CSV/Parquet file of new orders instead")
+    parser.add_argument("--memory-report", action="store_true", help="compare the loaded and compact in-memory frames")
+    parser.add_argument("--arrow", action="store_true", help="write the compact frame as an Arrow file shared by all server processes")
+    args = parser.parse_args()
+    if args.arrow:
+        n = write_arrow_snapshot(args.csv, args.out)
+        print(f"✅ Wrote {n:,} rows to {snapshot_path(args.out)}")
+    elif args.memory_report:
+        orders = load_orders(args.csv, args.out)
+        print(memory_report(orders, compact_orders(orders)).to_string())
+    elif args.append:
+        n = append_delta(args.append, args.out)
+        print(f"✅ Appended {n:,} rows to {args.out}")
+    else:
+        n = convert_csv_to_parquet(args.csv, args.out, args.chunksize)
+        print(f"✅ Wrote {n:,} rows to {args.out}")
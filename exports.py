@@ -0,0 +1,114 @@
+"""On-demand table exports for the download buttons.
+
+Exports are built only when a user clicks Download (Streamlit calls the
+``data`` callable then), written to disk in chunks of ``CHUNK_ROWS`` rows so
+the serialised file never has to sit in memory next to the table, and kept
+under ``.export_cache`` keyed by the table name and the state that produced
+it: the filters and the backend's ``dataset_id``, a digest of the files the
+data was read from, so a file written before an append, a re-conversion or a
+restart (or by another server process) is only reused for the same data. The cache is an LRU bounded by ``max_bytes``, tracked through
+file mtimes like the forecast model cache.
+"""
+import hashlib
+import os
+import threading
+
+EXPORT_DIR = ".export_cache"
+CHUNK_ROWS = 100_000
+
+# label -> (extension, mime type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow": ("arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+# --- Writers ---
+def _chunks(df, chunk_rows):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_csv(df, path, chunk_rows=CHUNK_ROWS):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for i, chunk in enumerate(_chunks(df, chunk_rows)):
+            chunk.to_csv(f, header=i == 0, index=False)
+
+
+def write_parquet(df, path, chunk_rows=CHUNK_ROWS):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_arrow(df, path, chunk_rows=CHUNK_ROWS):
+    import pyarrow as pa
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet, "arrow": write_arrow}
+
+
+class ExportCache:
+    """Disk LRU of exported files, shared by every session."""
+
+    def __init__(self, cache_dir=EXPORT_DIR, max_bytes=500 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(name, state):
+        raw = f"{name}\x1f{state!r}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path(self, name, state, fmt):
+        ext = EXPORT_FORMATS[fmt][0]
+        return os.path.join(self.cache_dir, f"{name}-{self.key(name, state)[:32]}.{ext}")
+
+    def export(self, name, state, fmt, df):
+        """Path of ``df`` exported as ``fmt``, writing it unless already cached."""
+        path = self.path(name, state, fmt)
+        if os.path.exists(path):
+            os.utime(path)
+            self.hits += 1
+            return path
+        self.misses += 1
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        WRITERS[EXPORT_FORMATS[fmt][0]](df, tmp)
+        os.replace(tmp, path)
+        self._evict()
+        return path
+
+    def read(self, name, state, fmt, df):
+        with open(self.export(name, state, fmt, df), "rb") as f:
+            return f.read()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            # the newest file is the one just written; never evict it
+            for _, size, path in sorted(entries)[:-1]:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
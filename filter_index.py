@@ -0,0 +1,75 @@
+"""Index for the global sidebar filters (region, category, segment, date range).
+
+Built once at load time. Rows are kept in order_date order so a date range is
+a pair of binary searches. Each region/category/segment column is kept as
+small integer codes over that order (one byte per row for up to 127 values,
+-1 where the value is missing), so the other filters are table lookups over
+the date slice only. Rows match exactly what ``isin`` masks on the raw
+columns would keep: a missing dimension value never matches a selection.
+
+``python -m benchmarks.check_filters`` compares the index with those masks.
+"""
+import numpy as np
+import pandas as pd
+
+INDEXED_COLUMNS = ["region", "category", "segment"]
+
+
+class FilterIndex:
+    def __init__(self, df, columns=INDEXED_COLUMNS, date_column="order_date"):
+        self.columns = list(columns)
+        self.date_column = date_column
+        self.n_rows = len(df)
+
+        dates = df[date_column].to_numpy()
+        # NaT never passes a date comparison, so those rows are left out
+        valid = np.flatnonzero(~pd.isna(dates))
+        self.order = valid[np.argsort(dates[valid], kind="stable")]
+        self.sorted_dates = dates[self.order]
+
+        # column -> ({value: code}, codes over the date-sorted positions)
+        self.codes = {}
+        self.has_missing = {}
+        for col in self.columns:
+            column = df[col]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                codes, uniques = column.cat.codes.to_numpy()[self.order], column.cat.categories
+            else:
+                codes, uniques = pd.factorize(column.to_numpy()[self.order])
+            codes = codes.astype(np.int8 if len(uniques) < 128 else np.int32)
+            self.codes[col] = ({u: i for i, u in enumerate(uniques)}, codes)
+            self.has_missing[col] = bool((codes < 0).any())
+
+    def _date_slice(self, start, end):
+        dtype = self.sorted_dates.dtype
+        lo = np.searchsorted(self.sorted_dates, pd.Timestamp(start).to_datetime64().astype(dtype), side="left")
+        hi = np.searchsorted(self.sorted_dates, pd.Timestamp(end).to_datetime64().astype(dtype), side="right")
+        return lo, max(lo, hi)
+
+    def _column_mask(self, col, selected, lo, hi):
+        lookup, codes = self.codes[col]
+        wanted = [lookup[value] for value in set(selected) if value in lookup]
+        if len(wanted) == len(lookup):
+            # every value selected: only rows missing the value are dropped
+            return codes[lo:hi] >= 0 if self.has_missing[col] else None
+        # one slot per code plus a last, always False one that code -1 lands on
+        table = np.zeros(len(lookup) + 1, dtype=bool)
+        table[wanted] = True
+        return table[codes[lo:hi]]
+
+    def positions(self, selections, start, end):
+        """Row positions (ascending) matching the selections and date range.
+
+        ``selections`` maps each indexed column to the list of selected values.
+        """
+        lo, hi = self._date_slice(start, end)
+        mask = None
+        for col in self.columns:
+            col_mask = self._column_mask(col, selections[col], lo, hi)
+            if col_mask is not None:
+                mask = col_mask if mask is None else mask & col_mask
+        rows = self.order[lo:hi]
+        if mask is not None:
+            rows = rows[mask]
+        # restore the original row order of a boolean-mask selection
+        return np.sort(rows)
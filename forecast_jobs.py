@@ -0,0 +1,120 @@
+"""Background Prophet fits for the Forecast page.
+
+Fits run on a small pool of worker threads instead of inside the script run,
+so the page stays interactive and shows progress while a model is fitted.
+Jobs are keyed by (filter_type, value, horizon, series fingerprint): a request
+matching a queued, running or finished job joins it instead of fitting again,
+so concurrent users asking for the same forecast share one fit. Finished jobs
+are kept (LRU, ``keep`` of them) for the page to pick up on its next run.
+
+Threads are enough: Prophet runs the fit itself in a CmdStan subprocess, and
+staying in the server process keeps fitted models in the shared ``ModelCache``.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from forecasting import evaluate_forecast, forecast_frame, series_fingerprint
+
+logger = logging.getLogger("dashboard.forecast")
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+RETRY_AFTER = 60  # seconds before a failed job may be submitted again
+
+
+def workers_from_env():
+    return int(os.environ.get("DASHBOARD_FORECAST_WORKERS", min(4, os.cpu_count() or 1)))
+
+
+class ForecastJob:
+    """One forecast request; ``result`` is (forecast, mape, rmse) once done."""
+
+    def __init__(self, filter_type, value, months):
+        self.filter_type = filter_type
+        self.value = value
+        self.months = months
+        self.state = QUEUED
+        self.progress = 0.0
+        self.message = "Waiting for a free worker"
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = self.finished = None
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self.state in (DONE, FAILED)
+
+    def elapsed(self):
+        return (self.finished or time.time()) - (self.started or self.submitted)
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def _update(self, progress, message):
+        if self.started is None:
+            self.started = time.time()
+            self.state = RUNNING
+        self.progress, self.message = progress, message
+
+    def _finish(self, result=None, error=None):
+        self.result, self.error = result, error
+        self.finished = time.time()
+        self.state = FAILED if error is not None else DONE
+        self.progress, self.message = 1.0, "Failed" if error is not None else "Done"
+        self._done.set()
+
+
+class ForecastQueue:
+    def __init__(self, model_cache, workers=None, keep=64):
+        self.model_cache = model_cache
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(max_workers=workers or workers_from_env(), thread_name_prefix="forecast")
+        self._jobs = OrderedDict()  # key -> ForecastJob
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(filter_type, value, ts, months):
+        return filter_type, value, months, series_fingerprint(ts)
+
+    def submit(self, filter_type, value, ts, months):
+        """The job for this forecast, starting one only if none is queued, running or done."""
+        key = self.key(filter_type, value, ts, months)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not (job.state == FAILED and time.time() - job.finished > RETRY_AFTER):
+                self._jobs.move_to_end(key)
+                return job
+            job = self._jobs[key] = ForecastJob(filter_type, value, months)
+            self._trim()
+        self._pool.submit(self._run, job, ts)
+        return job
+
+    def _trim(self):
+        # only finished jobs are dropped; queued and running ones have waiters
+        excess = len(self._jobs) - self.keep
+        for key in [k for k, job in self._jobs.items() if job.done][:max(0, excess)]:
+            del self._jobs[key]
+
+    def _run(self, job, ts):
+        try:
+            # ModelCache also merges fits of the same series at different horizons
+            job._update(0.1, "Fitting Prophet model")
+            model = self.model_cache.get_or_fit(job.filter_type, job.value, ts)
+            job._update(0.7, "Predicting")
+            forecast = forecast_frame(model, job.months)
+            job._update(0.9, "Evaluating")
+            mape, rmse = evaluate_forecast(ts, forecast)
+            job._finish(result=(forecast, mape, rmse))
+        except Exception as exc:
+            logger.exception("forecast %s=%s failed", job.filter_type, job.value)
+            job._finish(error=exc)
+
+    def stats(self):
+        with self._lock:
+            states = [job.state for job in self._jobs.values()]
+        return {state: states.count(state) for state in (QUEUED, RUNNING, DONE, FAILED)}
@@ -0,0 +1,262 @@
+"""Forecast helpers for the Forecast page.
+
+Two kinds of engine produce the same ``ds``/``yhat`` frame: Prophet, and fast
+NumPy engines (linear trend + monthly seasonality, seasonal naive) that fit
+many series at once as a single batched least-squares solve.
+
+Fitted Prophet models are cached by (filter_type, value, series fingerprint),
+so moving the "Months to Forecast" slider only re-runs ``predict``. The cache
+is an in-memory LRU backed by a size-bounded directory of serialized models,
+so fits survive restarts and are shared by every session of the server.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from data_store import wide_measures
+
+MODEL_CACHE_DIR = os.path.join(".forecast_cache", "models")
+BATCH_DIR = os.path.join(".forecast_cache", "batch")
+FORECAST_FILTERS = ["region", "category", "segment"]
+MAX_HORIZON = 12
+FAST_METHODS = {
+    "Trend + Seasonality (fast)": "linear",
+    "Seasonal Naive (fast)": "naive",
+}
+ENGINES = ["Prophet"] + list(FAST_METHODS)
+
+
+# --- Series ---
+def monthly_series(df, filter_type, value, measure="sales"):
+    """Monthly totals of ``measure`` for one region/category/segment value."""
+    filtered = df[df[filter_type] == value]
+    monthly = wide_measures(filtered[[measure]]).groupby(filtered['order_date'].dt.to_period("M"))[measure].sum().reset_index()
+    monthly['order_date'] = monthly['order_date'].dt.to_timestamp()
+    return monthly.rename(columns={'order_date': 'ds', measure: 'y'})
+
+
+def series_fingerprint(ts):
+    """Stable hash of a ds/y series; changes whenever the history changes."""
+    # normalise dtypes so CSV, Parquet and Arrow loads hash the same, and round to
+    # cents: the same lines summed in another order (one frame vs. appended segments) differ in the last bits
+    series = pd.DataFrame({'ds': ts['ds'].astype('datetime64[ns]'), 'y': ts['y'].astype('float64').round(2)})
+    hashed = pd.util.hash_pandas_object(series, index=False)
+    return hashlib.sha256(hashed.to_numpy().tobytes()).hexdigest()[:16]
+
+
+def fit_prophet(ts):
+    from prophet import Prophet
+
+    model = Prophet()
+    model.fit(ts)
+    return model
+
+
+def forecast_frame(model, months, freq=pd.offsets.MonthEnd()):
+    future = model.make_future_dataframe(periods=months, freq=freq)
+    return model.predict(future)
+
+
+# --- Fast engines ---
+def future_dates(last, months, freq=pd.offsets.MonthEnd()):
+    # Same dates Prophet's make_future_dataframe(freq=freq) produces
+    dates = pd.date_range(last, periods=months + 1, freq=freq)
+    return dates[dates > last][:months]
+
+
+def _design(ds, t0):
+    """Intercept, trend in years since ``t0`` and 11 calendar-month dummies."""
+    ds = pd.DatetimeIndex(ds)
+    X = np.zeros((len(ds), 13))
+    X[:, 0] = 1.0
+    X[:, 1] = (ds - t0) / pd.Timedelta(days=365.25)
+    month = ds.month.to_numpy()
+    rows = np.flatnonzero(month > 1)
+    X[rows, month[rows]] = 1.0
+    return X
+
+
+def _fit_linear(Y, ds, future):
+    t0 = ds[0]
+    beta, *_ = np.linalg.lstsq(_design(ds, t0), Y.T, rcond=None)
+    X = _design(ds.append(future), t0)
+    return (X @ beta).T
+
+
+def _fit_naive(Y, ds, future):
+    # each point is the value of the same calendar month one year earlier
+    months = np.concatenate([ds.month.to_numpy(), future.month.to_numpy()])
+    yhat = np.full((Y.shape[0], len(months)), np.nan)
+    last_seen = {}
+    for i, month in enumerate(months):
+        if month in last_seen:
+            yhat[:, i] = Y[:, last_seen[month]]
+        if i < len(ds):
+            last_seen[month] = i
+    return yhat
+
+
+def fast_forecast_batch(series, months, method="linear", freq=pd.offsets.MonthEnd()):
+    """Forecast many ds/y series at once; returns one ds/yhat frame per series.
+
+    Series that share the same ``ds`` values are stacked into a matrix and
+    solved together. Future dates are spaced by ``freq``, as in ``forecast_frame``.
+    """
+    fit = {"linear": _fit_linear, "naive": _fit_naive}[method]
+    groups = {}
+    for i, ts in enumerate(series):
+        groups.setdefault(tuple(ts['ds']), []).append(i)
+    results = [None] * len(series)
+    for key, members in groups.items():
+        ds = pd.DatetimeIndex(key)
+        future = future_dates(ds[-1], months, freq)
+        Y = np.vstack([series[i]['y'].to_numpy(dtype=float) for i in members])
+        yhat = fit(Y, ds, future)
+        all_ds = ds.append(future)
+        for row, i in enumerate(members):
+            results[i] = pd.DataFrame({'ds': all_ds, 'yhat': yhat[row]})
+    return results
+
+
+def fast_forecast(ts, months, method="linear"):
+    return fast_forecast_batch([ts], months, method)[0]
+
+
+def evaluate_forecast(ts, forecast):
+    """In-sample MAPE (%) and RMSE of ``forecast`` against the actuals."""
+    from sklearn.metrics import mean_absolute_percentage_error, mean_squared_error
+
+    merged = ts.merge(forecast[['ds', 'yhat']], on='ds', how='left').dropna()
+    mape = mean_absolute_percentage_error(merged['y'], merged['yhat']) * 100
+    rmse = np.sqrt(mean_squared_error(merged['y'], merged['yhat']))
+    return mape, rmse
+
+
+# --- Batch results ---
+# Written nightly by batch_forecast.py; the Forecast page uses them when the
+# stored fingerprint still matches the series it would fit.
+def load_batch_results(batch_dir=BATCH_DIR):
+    metrics_path = os.path.join(batch_dir, "metrics.parquet")
+    forecasts_path = os.path.join(batch_dir, "forecasts.parquet")
+    if not (os.path.exists(metrics_path) and os.path.exists(forecasts_path)):
+        return None
+    return pd.read_parquet(forecasts_path), pd.read_parquet(metrics_path)
+
+
+def batch_forecast_for(results, filter_type, value, ts, months):
+    """(forecast, mape, rmse) from the batch results, or None if absent or stale."""
+    if results is None:
+        return None
+    forecasts, metrics = results
+    row = metrics[(metrics['filter_type'] == filter_type) & (metrics['value'] == value)]
+    if row.empty or row['fingerprint'].iloc[0] != series_fingerprint(ts) or row['horizon'].iloc[0] < months:
+        return None
+    forecast = forecasts[(forecasts['filter_type'] == filter_type) & (forecasts['value'] == value)]
+    forecast = forecast[['ds', 'yhat']].sort_values('ds')
+    last = ts['ds'].max()
+    forecast = pd.concat([forecast[forecast['ds'] <= last], forecast[forecast['ds'] > last].head(months)])
+    return forecast.reset_index(drop=True), row['mape'].iloc[0], row['rmse'].iloc[0]
+
+
+# --- Model cache ---
+class ModelCache:
+    """Two-level LRU cache of fitted Prophet models.
+
+    ``max_models`` bounds the in-memory level, ``max_disk_bytes`` the on-disk
+    level. Disk recency is tracked through file mtimes, which are touched on
+    every hit.
+    """
+
+    def __init__(self, cache_dir=MODEL_CACHE_DIR, max_models=32, max_disk_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_models = max_models
+        self.max_disk_bytes = max_disk_bytes
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = self.disk_hits = self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(filter_type, value, ts):
+        raw = f"{filter_type}\x1f{value}\x1f{series_fingerprint(ts)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key, model):
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+
+    def _lookup(self, key):
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+        path = self._path(key)
+        if os.path.exists(path):
+            from prophet.serialize import model_from_json
+
+            with open(path, "r") as f:
+                model = model_from_json(f.read())
+            os.utime(path)
+            self.disk_hits += 1
+            self._remember(key, model)
+            return model
+        return None
+
+    def _store(self, key, model):
+        from prophet.serialize import model_to_json
+
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(model_to_json(model))
+        os.replace(tmp, path)
+        self._remember(key, model)
+        self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def get_or_fit(self, filter_type, value, ts, fit=fit_prophet):
+        """Return the cached model for this series, fitting it at most once."""
+        key = self.key(filter_type, value, ts)
+        model = self._lookup(key)
+        if model is not None:
+            return model
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # concurrent requests for the same series wait for a single fit
+        with key_lock:
+            model = self._lookup(key)
+            if model is None:
+                self.misses += 1
+                model = fit(ts)
+                self._store(key, model)
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return model
@@ -0,0 +1,152 @@
+"""Opt-in timing of the named steps of each page render.
+
+Enable with ``DASHBOARD_INSTRUMENT=1`` or by opening the app with ``?debug=1``.
+Each rerun records how long every ``with timer.step("...")`` block took. The
+timings are shown in a debug sidebar panel, logged as one JSON line per
+render (logger ``dashboard.timing``) and aggregated process-wide into
+Prometheus-style summaries (p50/p95, sum, count). Set
+``DASHBOARD_METRICS_FILE`` to also write them for a node_exporter textfile
+collector. The JSON size of each figure sent to the browser is recorded
+alongside (``timer.payload``). When disabled, ``step`` and ``payload`` are
+no-ops.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+logger = logging.getLogger("dashboard.timing")
+
+
+class MetricsRegistry:
+    """Process-wide step timings, shared by every session."""
+
+    def __init__(self, window=500):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._count = defaultdict(int)
+        self._sum = defaultdict(float)
+        self._bytes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, page, step, seconds):
+        key = (page, step)
+        with self._lock:
+            self._samples[key].append(seconds)
+            self._count[key] += 1
+            self._sum[key] += seconds
+
+    def observe_bytes(self, page, figure, nbytes):
+        with self._lock:
+            self._bytes[(page, figure)] = nbytes
+
+    def payload_summary(self):
+        """Rows of page, figure, kb for the last render of each figure."""
+        with self._lock:
+            items = sorted(self._bytes.items())
+        return [{"page": page, "figure": figure, "kb": nbytes / 1024} for (page, figure), nbytes in items]
+
+    def summary(self):
+        """Rows of page, step, count, p50_ms, p95_ms over the recent window."""
+        with self._lock:
+            items = [(key, np.array(samples), self._count[key]) for key, samples in self._samples.items()]
+        return [
+            {
+                "page": page,
+                "step": step,
+                "count": count,
+                "p50_ms": float(np.percentile(samples, 50)) * 1000,
+                "p95_ms": float(np.percentile(samples, 95)) * 1000,
+            }
+            for (page, step), samples, count in sorted(items)
+        ]
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP dashboard_step_seconds Time spent in a named step of a page render.",
+            "# TYPE dashboard_step_seconds summary",
+        ]
+        with self._lock:
+            keys = sorted(self._samples)
+            for page, step in keys:
+                samples = np.array(self._samples[(page, step)])
+                labels = f'page="{page}",step="{step}"'
+                for q in (0.5, 0.95):
+                    lines.append(f'dashboard_step_seconds{{{labels},quantile="{q}"}} {np.quantile(samples, q):.6f}')
+                lines.append(f"dashboard_step_seconds_sum{{{labels}}} {self._sum[(page, step)]:.6f}")
+                lines.append(f"dashboard_step_seconds_count{{{labels}}} {self._count[(page, step)]}")
+            if self._bytes:
+                lines.append("# HELP dashboard_figure_bytes JSON size of a figure in its last render.")
+                lines.append("# TYPE dashboard_figure_bytes gauge")
+            for (page, figure), nbytes in sorted(self._bytes.items()):
+                lines.append(f'dashboard_figure_bytes{{page="{page}",figure="{figure}"}} {nbytes}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+
+class RenderTimer:
+    """Collects the step timings of one script run."""
+
+    def __init__(self, registry, enabled=True):
+        self.registry = registry
+        self.enabled = enabled
+        self.page = "global"
+        self.steps = []
+        self.payloads = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def step(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((self.page, name, time.perf_counter() - start))
+
+    def payload(self, name, fig):
+        """Record the JSON size of ``fig``; serialising it is skipped when disabled."""
+        if self.enabled:
+            self.payloads.append((self.page, name, len(fig.to_json().encode("utf-8"))))
+
+    def set_page(self, page):
+        self.page = page.strip() or "global"
+
+    def finish(self):
+        """Publish this run's timings to the registry, the log and the textfile."""
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self._start
+        for page, name, seconds in self.steps:
+            self.registry.observe(page, name, seconds)
+        self.registry.observe(self.page, "total", total)
+        for page, name, nbytes in self.payloads:
+            self.registry.observe_bytes(page, name, nbytes)
+        logger.info(json.dumps({
+            "event": "page_render",
+            "page": self.page,
+            "total_ms": round(total * 1000, 3),
+            "steps": {f"{page}/{name}": round(seconds * 1000, 3) for page, name, seconds in self.steps},
+            "figure_bytes": {f"{page}/{name}": nbytes for page, name, nbytes in self.payloads},
+        }))
+        path = os.environ.get("DASHBOARD_METRICS_FILE")
+        if path:
+            self.registry.write_textfile(path)
+
+
+def instrumentation_enabled(query_params):
+    if os.environ.get("DASHBOARD_INSTRUMENT", "").lower() in ("1", "true", "yes"):
+        return True
+    return query_params.get("debug") in ("1", "true")
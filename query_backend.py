@@ -0,0 +1,498 @@
+"""Query backends behind the dashboard pages.
+
+Every page asks a backend for its summary tables instead of working on a
+DataFrame directly. Two implementations answer the same questions:
+
+* ``PandasBackend`` keeps the orders in memory, in the compact form of
+  ``data_store.compact_orders``, and uses the FilterIndex and OrderCube built
+  at load time. Part files appended to the Parquet dataset
+  later are read on ``refresh`` and added as new segments, so new orders cost
+  time in proportion to the delta.
+* ``DuckDBBackend`` runs each summary as SQL over the Parquet dataset written
+  by ``data_store.py``. Filters are pushed down into the scan (including the
+  ``order_year`` partitions), so datasets larger than RAM work, and DuckDB
+  runs the scans vectorized across all cores.
+
+Select one with ``DASHBOARD_BACKEND=pandas|duckdb`` (default ``pandas``).
+The app keeps one backend per server process; results of its query methods
+are shared by every session through a size-bounded ``ResultCache``.
+"""
+import os
+import threading
+from typing import NamedTuple
+
+import pandas as pd
+
+from approx import SAMPLE_COLUMNS, STRATA, StratifiedSample, allocate, sample_rows_from_env
+from cube import OrderCube, sum_by, summarize_shipping, trends_by_period
+from data_store import (
+    CSV_PATH,
+    MONTH_CODE,
+    PARQUET_DIR,
+    DatasetWatcher,
+    compact_orders,
+    concat_compact,
+    dataset_files,
+    dataset_id,
+    file_stamps,
+    load_orders_with_files,
+    plain_columns,
+    read_parquet_files,
+    wide_measures,
+)
+from filter_index import FilterIndex
+from forecasting import monthly_series
+from result_cache import ResultCache, cached
+
+BACKENDS = ["pandas", "duckdb"]
+
+
+def backend_name():
+    name = os.environ.get("DASHBOARD_BACKEND", "pandas").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"DASHBOARD_BACKEND must be one of {BACKENDS}, got {name!r}")
+    return name
+
+
+class Filters(NamedTuple):
+    """Normalized sidebar filter state; hashable, so usable as a cache key."""
+
+    region: tuple
+    category: tuple
+    segment: tuple
+    start: pd.Timestamp
+    end: pd.Timestamp
+
+    @classmethod
+    def make(cls, region, category, segment, start, end):
+        return cls(
+            tuple(sorted(region)), tuple(sorted(category)), tuple(sorted(segment)),
+            pd.Timestamp(start), pd.Timestamp(end),
+        )
+
+    def selections(self):
+        return {"region": list(self.region), "category": list(self.category), "segment": list(self.segment)}
+
+
+def add_customer_metrics(customer_sales):
+    customer_sales['avg_order_value'] = customer_sales['sales'] / customer_sales['order_id']
+    return customer_sales
+
+
+def discount_pivot(discount_profit):
+    """Product x discount profit matrix from ``product_discount_profit`` rows."""
+    return discount_profit.pivot_table(values='profit', index='product_name', columns='discount', aggfunc='sum', fill_value=0, observed=True)
+
+
+# --- pandas ---
+class PandasBackend:
+    name = "pandas"
+    # appended deltas are merged into one segment past this count; the first segment is never merged
+    MAX_SEGMENTS = 32
+
+    def __init__(self, df, watcher=None, sources=None):
+        self.watcher = watcher
+        self.version = 0  # bumped on every append, for cache keys
+        # files the rows were read from; their digest keys anything kept beyond this process
+        self.sources = dict(sources or {})
+        self.dataset_id = dataset_id(self.sources)
+        self.n_rows = 0
+        self.cube = self._build_cube(df)
+        self._lock = threading.Lock()
+        # shared by every session; pages ask for several summaries of the same filters
+        self.results = ResultCache()
+
+    @property
+    def segments(self):
+        return self.cube.segments
+
+    def _segment(self, df):
+        df = compact_orders(df).set_axis(pd.RangeIndex(self.n_rows, self.n_rows + len(df)))
+        self.n_rows += len(df)
+        return df, FilterIndex(df)
+
+    def _build_cube(self, df):
+        self.n_rows = 0
+        return OrderCube(*self._segment(df))
+
+    def append(self, delta):
+        """Merge new order lines into the index, cube and derived columns."""
+        with self._lock:
+            self._append(delta)
+
+    def _append(self, delta, sources=None):
+        if sources:
+            self.sources.update(sources)
+            self.dataset_id = dataset_id(self.sources)
+        if len(self.segments) >= self.MAX_SEGMENTS:
+            # copying the first segment would pull a memory-mapped snapshot into private memory
+            self.n_rows = len(self.segments[0][0])
+            appended = concat_compact([df for df, _ in self.segments[1:]] + [compact_orders(delta)])
+            self.cube.fold_appended(*self._segment(appended))
+        else:
+            self.cube.append(*self._segment(delta))
+        self.version += 1
+        self.clear_cache()
+
+    def refresh(self, force=False):
+        """Append part files added to the dataset since the last check."""
+        if self.watcher is None:
+            return 0
+        # every session's script run calls this; only one may claim and append a new file
+        with self._lock:
+            files = self.watcher.new_files(force)
+            if not files:
+                return 0
+            delta = read_parquet_files(files)
+            self._append(delta, file_stamps(files))
+        return len(delta)
+
+    def clear_cache(self):
+        self.results.clear()
+
+    @cached
+    def dimension_values(self, column):
+        values = dict.fromkeys(v for df, _ in self.segments for v in df[column].dropna().unique())
+        return list(values)
+
+    def date_bounds(self):
+        return self.cube.min_date, self.cube.max_date
+
+    @cached(copy=False)
+    def _positions(self, filters):
+        """Row positions per segment matching ``filters``; None where every row matches."""
+        positions = []
+        for df, index in self.segments:
+            rows = index.positions(filters.selections(), filters.start, filters.end)
+            positions.append(None if len(rows) == len(df) else rows)
+        return positions
+
+    def filtered(self, filters, columns=None):
+        """Rows matching ``filters``, with only ``columns`` if given.
+
+        Only the positions are cached (a copy of most rows would not fit the
+        result cache); a segment whose rows all match is returned uncopied.
+        """
+        parts = []
+        for (df, _), rows in zip(self.segments, self._positions(filters)):
+            df = df if columns is None else df[columns]
+            parts.append(df if rows is None else df.iloc[rows])
+        return parts[0] if len(parts) == 1 else concat_compact(parts)
+
+    @cached(copy=False)
+    def _cells(self, filters):
+        return self.cube.cells(filters.selections(), filters.start, filters.end)
+
+    @cached
+    def kpis(self, filters):
+        f = self.filtered(filters, ["sales", "profit", "quantity"])
+        # rows hold int16 quantities; accumulate in 64 bits
+        return {
+            m: f[m].to_numpy().sum(dtype=dtype)
+            for m, dtype in (("sales", "float64"), ("profit", "float64"), ("quantity", "int64"))
+        }
+
+    @cached
+    def sales_by(self, filters, keys, measures):
+        return sum_by(self._cells(filters), keys, measures)
+
+    @cached
+    def trends(self, filters, freq):
+        return trends_by_period(self._cells(filters), freq)
+
+    @cached
+    def category_summary(self, filters):
+        cat_data = sum_by(self._cells(filters), ['category', 'sub-category'], ['sales', 'profit', 'quantity'])
+        # Distinct orders are not additive across cube cells, so count them on the filtered rows
+        cat_data['avg_order_size'] = cat_data['quantity'] / self.filtered(filters, ['order_id'])['order_id'].nunique()
+        return cat_data
+
+    @cached
+    def state_summary(self, filters):
+        return sum_by(self._cells(filters), 'state', ['sales', 'profit'])
+
+    @cached
+    def shipping_summary(self, filters):
+        return summarize_shipping(self._cells(filters))
+
+    @cached
+    def customer_summary(self, filters):
+        f = self.filtered(filters, ['customer_name', 'sales', 'profit', 'order_id', 'discount'])
+        customer_sales = wide_measures(f).groupby('customer_name', observed=True).agg({
+            'sales': 'sum',
+            'profit': 'sum',
+            'order_id': 'count',
+            'discount': 'mean'
+        }).reset_index()
+        return add_customer_metrics(plain_columns(customer_sales))
+
+    def _products(self, filters, category, sub_categories=None, columns=()):
+        f = self.filtered(filters, ['category', 'sub-category', *columns])
+        prod_df = f[f['category'] == category]
+        if sub_categories:
+            prod_df = prod_df[prod_df['sub-category'].isin(sub_categories)]
+        return prod_df
+
+    @cached
+    def categories(self, filters):
+        return self.filtered(filters, ['category'])['category'].unique().tolist()
+
+    @cached
+    def sub_categories(self, filters, category):
+        return self._products(filters, category)['sub-category'].unique().tolist()
+
+    @cached
+    def avg_discount(self, filters, category, sub_categories=None):
+        return wide_measures(self._products(filters, category, sub_categories, ['discount'])[['discount']])['discount'].mean()
+
+    @cached
+    def product_discount_profit(self, filters, category, sub_categories=None):
+        columns = ['product_name', 'discount', 'profit']
+        prod_df = wide_measures(self._products(filters, category, sub_categories, columns)[columns])
+        # float32 discounts would show as 0.20000000298 in the heatmap axis
+        prod_df['discount'] = prod_df['discount'].round(4)
+        return plain_columns(prod_df.groupby(['product_name', 'discount'], observed=True)['profit'].sum().reset_index())
+
+    @cached
+    def product_summary(self, filters, category, sub_categories=None):
+        columns = ['product_name', 'sales', 'profit']
+        prod_df = wide_measures(self._products(filters, category, sub_categories, columns)[columns])
+        return plain_columns(prod_df.groupby('product_name', observed=True)[['sales', 'profit']].sum().reset_index())
+
+    def stratified_sample(self, size=None):
+        """Sample for approximate mode (see approx.py)."""
+        frames = [df for df, _ in self.segments]
+        return StratifiedSample.draw(frames[0] if len(frames) == 1 else concat_compact(frames), size)
+
+    @cached
+    def monthly_series(self, filter_type, value, measure="sales"):
+        parts = [monthly_series(df, filter_type, value, measure) for df, _ in self.segments]
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts).groupby('ds', as_index=False)['y'].sum()
+
+
+# --- DuckDB ---
+TREND_PERIODS = {
+    "M": "strftime(order_date, '%Y-%m')",
+    "Q": "CAST(year(order_date) AS VARCHAR) || 'Q' || CAST(quarter(order_date) AS VARCHAR)",
+    "Y": "CAST(year(order_date) AS VARCHAR)",
+}
+TREND_STARTS = {"M": "month", "Q": "quarter", "Y": "year"}
+
+
+class DuckDBBackend:
+    name = "duckdb"
+
+    def __init__(self, parquet_dir=PARQUET_DIR, threads=None):
+        import duckdb
+
+        if not os.path.isdir(parquet_dir):
+            raise FileNotFoundError(f"{parquet_dir} not found; run `python data_store.py` first")
+        self._con = duckdb.connect()
+        if threads:
+            self._con.execute(f"SET threads = {int(threads)}")
+        glob = os.path.join(parquet_dir, "**", "*.parquet").replace("'", "''")
+        self._con.execute(
+            f"CREATE VIEW orders AS SELECT * FROM read_parquet('{glob}', hive_partitioning = true)"
+        )
+        self._lock = threading.Lock()
+        # every query re-expands the glob, so appended files need no work beyond a new cache version
+        self.watcher = DatasetWatcher(parquet_dir, dataset_files(parquet_dir))
+        self.version = 0
+        self.dataset_id = dataset_id(file_stamps(self.watcher.seen))
+        self.results = ResultCache()
+
+    def refresh(self):
+        with self._lock:
+            if self.watcher.new_files():
+                self.dataset_id = dataset_id(file_stamps(self.watcher.seen))
+                self.version += 1
+                self.clear_cache()
+        return 0
+
+    def clear_cache(self):
+        self.results.clear()
+
+    def _query(self, sql, params=None):
+        # one cursor per query: cursors are safe to use from concurrent sessions
+        with self._lock:
+            cursor = self._con.cursor()
+        return cursor.execute(sql, params or {}).df()
+
+    def _where(self, filters):
+        if not (filters.region and filters.category and filters.segment):
+            return "WHERE false", {}
+        params = {
+            "region": list(filters.region),
+            "category": list(filters.category),
+            "segment": list(filters.segment),
+            "start": filters.start.to_pydatetime(),
+            "end": filters.end.to_pydatetime(),
+            "start_year": filters.start.year,
+            "end_year": filters.end.year,
+        }
+        where = (
+            "WHERE order_year BETWEEN $start_year AND $end_year"
+            " AND order_date >= $start AND order_date <= $end"
+            " AND list_contains($region, region)"
+            " AND list_contains($category, category)"
+            " AND list_contains($segment, segment)"
+        )
+        return where, params
+
+    @cached
+    def dimension_values(self, column):
+        return self._query(f'SELECT DISTINCT "{column}" AS v FROM orders WHERE "{column}" IS NOT NULL ORDER BY 1')["v"].tolist()
+
+    def date_bounds(self):
+        row = self._query("SELECT min(order_date) AS lo, max(order_date) AS hi FROM orders")
+        return pd.Timestamp(row["lo"].iloc[0]), pd.Timestamp(row["hi"].iloc[0])
+
+    @cached
+    def kpis(self, filters):
+        where, params = self._where(filters)
+        row = self._query(
+            f"SELECT coalesce(sum(sales), 0) AS sales, coalesce(sum(profit), 0) AS profit, "
+            f"coalesce(sum(quantity), 0) AS quantity FROM orders {where}", params,
+        )
+        return row.iloc[0].to_dict()
+
+    @cached
+    def sales_by(self, filters, keys, measures):
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        measures = [measures] if isinstance(measures, str) else list(measures)
+        cols = ", ".join(f'"{k}"' for k in keys)
+        aggs = ", ".join(f'sum("{m}") AS "{m}"' for m in measures)
+        where, params = self._where(filters)
+        return self._query(f"SELECT {cols}, {aggs} FROM orders {where} GROUP BY ALL ORDER BY {cols}", params)
+
+    @cached
+    def trends(self, filters, freq):
+        where, params = self._where(filters)
+        return self._query(
+            f"SELECT {TREND_PERIODS[freq]} AS period, category, sum(sales) AS sales, sum(profit) AS profit, "
+            f"sum(quantity) AS quantity FROM orders {where} "
+            f"GROUP BY period, category, date_trunc('{TREND_STARTS[freq]}', order_date) "
+            f"ORDER BY date_trunc('{TREND_STARTS[freq]}', order_date), category",
+            params,
+        )
+
+    @cached
+    def category_summary(self, filters):
+        where, params = self._where(filters)
+        return self._query(
+            f"""SELECT category, "sub-category", sum(sales) AS sales, sum(profit) AS profit,
+                   sum(quantity) AS quantity,
+                   sum(quantity) / (SELECT count(DISTINCT order_id) FROM orders {where}) AS avg_order_size
+            FROM orders {where} GROUP BY ALL ORDER BY category, "sub-category\"""",
+            params,
+        )
+
+    @cached
+    def state_summary(self, filters):
+        return self.sales_by(filters, "state", ["sales", "profit"])
+
+    @cached
+    def shipping_summary(self, filters):
+        where, params = self._where(filters)
+        return self._query(
+            f"SELECT ship_mode, count(order_id) AS order_id, sum(sales) AS sales, avg(quantity) AS quantity, "
+            f"sum(profit) AS profit FROM orders {where} GROUP BY ship_mode ORDER BY ship_mode",
+            params,
+        )
+
+    @cached
+    def customer_summary(self, filters):
+        where, params = self._where(filters)
+        customer_sales = self._query(
+            f"SELECT customer_name, sum(sales) AS sales, sum(profit) AS profit, count(order_id) AS order_id, "
+            f"avg(discount) AS discount FROM orders {where} GROUP BY customer_name ORDER BY customer_name",
+            params,
+        )
+        return add_customer_metrics(customer_sales)
+
+    def _product_where(self, filters, category, sub_categories=None):
+        where, params = self._where(filters)
+        if not params:
+            return where, params
+        extra = " AND category = $product_category"
+        params["product_category"] = category
+        if sub_categories:
+            extra += ' AND list_contains($sub_categories, "sub-category")'
+            params["sub_categories"] = list(sub_categories)
+        return where + extra, params
+
+    @cached
+    def categories(self, filters):
+        where, params = self._where(filters)
+        return self._query(f"SELECT DISTINCT category FROM orders {where} ORDER BY 1", params)["category"].tolist()
+
+    @cached
+    def sub_categories(self, filters, category):
+        where, params = self._product_where(filters, category)
+        return self._query(f'SELECT DISTINCT "sub-category" AS v FROM orders {where} ORDER BY 1', params)["v"].tolist()
+
+    @cached
+    def avg_discount(self, filters, category, sub_categories=None):
+        where, params = self._product_where(filters, category, sub_categories)
+        return self._query(f"SELECT avg(discount) AS d FROM orders {where}", params)["d"].iloc[0]
+
+    @cached
+    def product_discount_profit(self, filters, category, sub_categories=None):
+        where, params = self._product_where(filters, category, sub_categories)
+        return self._query(
+            f"SELECT product_name, discount, sum(profit) AS profit FROM orders {where} "
+            f"GROUP BY ALL ORDER BY product_name, discount",
+            params,
+        )
+
+    @cached
+    def product_summary(self, filters, category, sub_categories=None):
+        where, params = self._product_where(filters, category, sub_categories)
+        return self._query(
+            f"SELECT product_name, sum(sales) AS sales, sum(profit) AS profit FROM orders {where} "
+            f"GROUP BY product_name ORDER BY product_name",
+            params,
+        )
+
+    def stratified_sample(self, size=None):
+        """Sample for approximate mode (see approx.py); scans to count the strata, then to sample."""
+        strata = self._query("SELECT region, category, segment, count(*) AS n FROM orders GROUP BY ALL ORDER BY ALL")
+        take = allocate(strata["n"], size or sample_rows_from_env())
+        params = {key: strata[key].tolist() for key in STRATA}
+        params.update(stratum=list(range(len(strata))), take=take.tolist())
+        cols = ", ".join(f'o."{c}"' for c in SAMPLE_COLUMNS if c != MONTH_CODE)
+        rows = self._query(
+            f"""SELECT {cols}, s.stratum FROM orders o
+            JOIN (SELECT unnest($region) AS region, unnest($category) AS category, unnest($segment) AS segment,
+                         unnest($stratum) AS stratum, unnest($take) AS take) s USING (region, category, segment)
+            QUALIFY row_number() OVER (PARTITION BY s.stratum ORDER BY random()) <= s.take""",
+            params,
+        )
+        counts = self._query(
+            "SELECT order_id, category, count(*) AS n FROM orders "
+            "WHERE order_id IN (SELECT unnest($ids)) GROUP BY ALL",
+            {"ids": rows["order_id"].unique().tolist()},
+        ).pivot(index="order_id", columns="category", values="n").fillna(0)
+        return StratifiedSample(rows.drop(columns="stratum"), rows["stratum"], strata["n"], counts.reindex(rows["order_id"]))
+
+    @cached
+    def monthly_series(self, filter_type, value, measure="sales"):
+        return self._query(
+            f'SELECT CAST(date_trunc(\'month\', order_date) AS TIMESTAMP) AS ds, sum("{measure}") AS y '
+            f'FROM orders WHERE "{filter_type}" = $value GROUP BY ds ORDER BY ds',
+            {"value": value},
+        )
+
+
+def make_backend(name, csv_path=CSV_PATH, parquet_dir=PARQUET_DIR):
+    if name == "duckdb":
+        return DuckDBBackend(parquet_dir)
+    df, files = load_orders_with_files(csv_path, parquet_dir)
+    # only a Parquet-backed frame can pick up appended part files
+    watcher = DatasetWatcher(parquet_dir, files) if files else None
+    backend = PandasBackend(df, watcher, file_stamps(files or [csv_path]))
+    # parts appended after an Arrow snapshot was written become segments of their own
+    backend.refresh(force=True)
+    return backend
@@ -0,0 +1,150 @@
+"""Process-wide LRU of query results, shared by every session.
+
+The backend is one shared, read-only object per server process; this cache
+sits in front of its query methods so sessions asking for the same filters
+reuse one result instead of each computing (and holding) their own. Keys are
+the method name and its arguments, where the sidebar state is the
+normalized ``Filters`` tuple. The cache is bounded by the estimated size of
+the stored results (``DASHBOARD_RESULT_CACHE_MB``, default 256) and evicts
+least recently used entries; hits, misses and evictions are counted for the
+debug panel.
+"""
+import functools
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_MB = 256
+
+
+def max_bytes_from_env():
+    return int(float(os.environ.get("DASHBOARD_RESULT_CACHE_MB", DEFAULT_MAX_MB)) * 2**20)
+
+
+def result_nbytes(value):
+    """Approximate memory held by a cached result."""
+    # per column: DataFrame.memory_usage(deep=True) costs about 1 ms even on a 4-row summary
+    if isinstance(value, pd.DataFrame):
+        return sum(result_nbytes(column) for _, column in value.items())
+    if isinstance(value, (pd.Series, pd.Index)):
+        if value.dtype == object:
+            return int(value.memory_usage(deep=True))
+        return value.array.nbytes
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(result_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(result_nbytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes_from_env() if max_bytes is None else max_bytes
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _store(self, key, value):
+        size = result_nbytes(value)
+        if size > self.max_bytes:
+            return  # would evict everything else; recompute it instead
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Cached value for ``key``, computing it at most once across threads."""
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry[0]
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # sessions asking for the same result at once wait for a single computation
+        with key_lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry[0]
+            with self._lock:
+                self.misses += 1
+            value = compute()
+            self._store(key, value)
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "mb": self.nbytes / 2**20,
+                "max_mb": self.max_bytes / 2**20,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def _hashable(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+def cache_key(name, version, args=(), kwargs=None):
+    """Key under which ``cached`` stores a call of method ``name``."""
+    return (name, version, *map(_hashable, args), *sorted((k, _hashable(v)) for k, v in (kwargs or {}).items()))
+
+
+def cached(method=None, *, copy=True):
+    """Serve a backend method from ``self.results``.
+
+    The key includes ``self.version``, so a result computed while new orders
+    were being appended is never served for the new data.
+    Results handed to page code are copies (pages add columns to their
+    tables); ``copy=False`` is for results only used inside the backend.
+    """
+    if method is None:
+        return functools.partial(cached, copy=copy)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = cache_key(method.__name__, self.version, args, kwargs)
+        value = self.results.get_or_compute(key, lambda: method(self, *args, **kwargs))
+        if copy and isinstance(value, (pd.DataFrame, pd.Series)):
+            return value.copy()
+        return value
+
+    return wrapper
@@ -0,0 +1,59 @@
+"""Trigram index for the name search boxes on the Customers and Products pages.
+
+The index is built over the distinct names of a column, not the order lines.
+A query is answered by intersecting the posting lists of its trigrams and then
+checking the few candidates for a real case-insensitive substring match.
+Queries shorter than three characters are checked against every distinct
+name, which is still far fewer strings than the order lines.
+"""
+from collections import defaultdict
+
+import numpy as np
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self, names):
+        self.names = np.asarray(list(names), dtype=object)
+        self.lowered = [str(name).lower() for name in self.names]
+        postings = defaultdict(list)
+        for i, name in enumerate(self.lowered):
+            for gram in trigrams(name):
+                postings[gram].append(i)
+        self.postings = {gram: np.asarray(ids, dtype=np.int64) for gram, ids in postings.items()}
+
+    def _candidates(self, query):
+        grams = trigrams(query)
+        if not grams:
+            return range(len(self.lowered))
+        lists = []
+        for gram in grams:
+            ids = self.postings.get(gram)
+            if ids is None:
+                return []
+            lists.append(ids)
+        lists.sort(key=len)
+        ids = lists[0]
+        for other in lists[1:]:
+            ids = np.intersect1d(ids, other, assume_unique=True)
+            if not len(ids):
+                break
+        return ids
+
+    def search(self, query):
+        """Distinct names containing ``query``, ignoring case."""
+        query = query.lower()
+        ids = [i for i in self._candidates(query) if query in self.lowered[i]]
+        return self.names[ids].tolist()
+
+    def mask(self, values, query):
+        """Boolean array marking the ``values`` that contain ``query``.
+
+        A set lookup per value; ``Series.isin`` is several times slower on
+        pandas string columns.
+        """
+        matches = set(self.search(query))
+        return np.fromiter((value in matches for value in values), dtype=bool, count=len(values))
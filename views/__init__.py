@@ -0,0 +1,29 @@
+"""Dashboard pages, one module per page.
+
+A page module is imported the first time its page is selected, so a cold
+start only pays for the page being shown: Plotly loads with the first chart
+page and the forecasting stack with the Forecast page. Each module exposes
+``render(ctx)`` taking a ``views.common.PageContext``.
+
+(The package is not called ``pages``: Streamlit would treat that directory as
+a multipage app.)
+"""
+import importlib
+
+# menu label -> (module, menu icon)
+PAGES = {
+    " Home": ("home", "house"),
+    " Sales": ("sales", "bar-chart"),
+    " Customers": ("customers", "people"),
+    " Products": ("products", "box"),
+    " Trends": ("trends", "graph-up"),
+    " Category": ("category", "calculator"),
+    " Location": ("location", "geo"),
+    " Shipping": ("shipping", "truck"),
+    " Forecast": ("forecast", "graph-up-arrow"),
+}
+
+
+def load(label):
+    """The page module for a menu label, imported on first use."""
+    return importlib.import_module(f"{__name__}.{PAGES[label][0]}")
@@ -0,0 +1,37 @@
+"""Category: sales and profit margin by category and sub-category."""
+import plotly.express as px
+import streamlit as st
+
+from views.common import ci_columns, download_table
+
+
+def render(ctx):
+    backend, filters, timer = ctx.backend, ctx.filters, ctx.timer
+    st.markdown("<div class='section-title'> Category Insights</div>", unsafe_allow_html=True)
+    st.markdown(" We break down performance by category and sub-category here. You can explore which combinations are selling more and which offer better profit margins.", unsafe_allow_html=True)
+
+    with timer.step("groupby"):
+        cat_data = backend.category_summary(filters)
+    cat_data['profit_margin'] = (cat_data['profit'] / cat_data['sales']) * 100
+    kpi1, kpi2 = st.columns(2)
+    with kpi1:
+        st.metric(" Avg Order Size", f"{cat_data['avg_order_size'].mean():.2f}")
+    with kpi2:
+        st.metric(" Avg Profit Margin", f"{cat_data['profit_margin'].mean():.2f}%")
+    tab1, tab2 = st.tabs([" Visual Analysis", " Data Table"])
+    with tab1, timer.step("figure:treemap"):
+        fig1 = px.treemap(
+            cat_data,
+            path=['category', 'sub-category'],
+            values='sales',
+            color='profit_margin',
+            color_continuous_scale='RdYlGn',
+            hover_data={'sales': ':.2f', 'profit': ':.2f', 'avg_order_size': True, 'profit_margin': ':.2f', **{c: ':.2f' for c in ci_columns(cat_data)}}
+        )
+        fig1.update_layout(title=' Sales & Profit Margin by Category/Sub-Category')
+        ctx.show_chart(fig1, "treemap")
+    with tab2:
+        search = st.text_input("🔎 Search Sub-Category:")
+        filtered = cat_data[cat_data['sub-category'].str.contains(search, case=False)] if search else cat_data
+        st.dataframe(filtered[['category', 'sub-category', 'sales', 'profit', 'avg_order_size', 'profit_margin'] + ci_columns(filtered)])
+        download_table("💾 Download Table", filtered, "category_summary", (filters, backend.dataset_id, search))
@@ -0,0 +1,98 @@
+"""Cached resources and helpers shared by the app shell and the page modules."""
+from functools import partial
+
+import streamlit as st
+
+from approx import Refiner, SampleKeeper
+from exports import EXPORT_FORMATS, ExportCache
+from query_backend import backend_name, make_backend
+from search_index import TrigramIndex
+
+
+# --- Data ---
+@st.cache_resource
+def get_backend():
+    # DASHBOARD_BACKEND=pandas (in memory, default) or duckdb (SQL over data/superstore_parquet).
+    # Reads data/superstore_parquet when present, else cleaned_superstore.csv
+    return make_backend(backend_name())
+
+# `version` changes whenever new orders are appended, so these re-run then
+@st.cache_data
+def dimension_options(column, version):
+    return get_backend().dimension_values(column)
+
+@st.cache_data
+def dataset_date_bounds(version):
+    return get_backend().date_bounds()
+
+@st.cache_resource(max_entries=2)
+def name_index(column, version):
+    # Trigram index over the distinct customer / product names; only the current version's are kept
+    return TrigramIndex(get_backend().dimension_values(column))
+
+
+# --- Approximate mode ---
+@st.cache_resource
+def get_sample_keeper():
+    # Stratified sample behind approximate mode; drawn in the background when the backend loads,
+    # and again when orders are appended
+    keeper = SampleKeeper(get_backend().stratified_sample)
+    keeper.start(get_backend().version)
+    return keeper
+
+def order_sample(version):
+    # The previous version's sample answers until the new one is drawn; None until the first one is
+    return get_sample_keeper().get(version)
+
+@st.cache_resource
+def get_refiner():
+    # Exact results computed in the background, shared by every session
+    return Refiner()
+
+@st.fragment(run_every=0.5)
+def refinement_progress(keys):
+    # Only this block re-runs until the exact figures are ready, then the page re-runs with them
+    pending = get_refiner().pending(keys)
+    if not pending:
+        st.rerun()
+    st.info(f"≈ Approximate figures from a stratified sample of {len(order_sample(get_backend().version)):,} order lines "
+            f"(error bars: 95% confidence intervals). Computing exact figures… {len(keys) - len(pending)}/{len(keys)}")
+
+def error_bars(df, y):
+    # Estimates carry the half-width of their 95% confidence interval in `<y>_ci`
+    return {"error_y": f"{y}_ci"} if f"{y}_ci" in df else {}
+
+def ci_columns(df):
+    return [col for col in df.columns if col.endswith("_ci")]
+
+
+# --- Output ---
+@st.cache_resource
+def get_export_cache():
+    # Exported files are shared by every session (LRU under .export_cache)
+    return ExportCache()
+
+def download_table(label, df, name, state):
+    # Nothing is serialised on render: the file is written when the button is
+    # clicked, in chunks, and reused while `state` (the filters and backend.dataset_id behind df) holds;
+    # the files outlive the process, so `state` must not hold per-process counters like backend.version
+    fmt = st.radio("Export format", list(EXPORT_FORMATS), horizontal=True, key=f"{name}_export_format")
+    if ci_columns(df):
+        state = (state, "estimate")  # never serve an estimate's file for the exact table
+    ext, mime = EXPORT_FORMATS[fmt]
+    data = partial(get_export_cache().read, name, state, fmt, df)
+    st.download_button(label, data, f"{name}.{ext}", mime, on_click="ignore")
+
+
+class PageContext:
+    """What every page's ``render`` gets: the shared backend, this run's filters and timer."""
+
+    def __init__(self, backend, filters, timer):
+        self.backend = backend
+        self.filters = filters
+        self.timer = timer
+
+    def show_chart(self, fig, name):
+        # Records the figure's payload size for the debug panel, then sends it
+        self.timer.payload(name, fig)
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,42 @@
+"""Customers: high/low value customers, top and bottom customers by profit."""
+import plotly.express as px
+import streamlit as st
+
+from views.common import download_table, name_index
+
+
+def render(ctx):
+    backend, filters, timer = ctx.backend, ctx.filters, ctx.timer
+    st.markdown("<div class='section-title'> Customer Insights</div>", unsafe_allow_html=True)
+    st.markdown(" This section tells the story of our customers—who are buying the most, who's giving us the most profit, and who might be less profitable. Great for identifying high-value customers.", unsafe_allow_html=True)
+
+    with timer.step("groupby"):
+        # served from the backend's shared result cache after the first request for these filters
+        customer_sales = backend.customer_summary(filters)
+        high_value_threshold = customer_sales['sales'].quantile(0.75)
+    filter_type = st.radio("Select Customer Segment:", ["All", "High-Value", "Low-Value"])
+    if filter_type == "High-Value":
+        customer_sales = customer_sales[customer_sales['sales'] >= high_value_threshold]
+    elif filter_type == "Low-Value":
+        customer_sales = customer_sales[customer_sales['sales'] < high_value_threshold]
+    st.metric(" Avg. Order Value", f"${customer_sales['avg_order_value'].mean():,.2f}")
+    st.metric(" Avg. Discount", f"{customer_sales['discount'].mean():.2%}")
+    search_name = st.text_input(" Search Customer by Name")
+    if search_name:
+        with timer.step("search"):
+            index = name_index('customer_name', backend.version)
+            customer_sales = customer_sales[index.mask(customer_sales['customer_name'], search_name)]
+    top_profit = customer_sales.nlargest(10, 'profit')
+    bottom_profit = customer_sales.nsmallest(10, 'profit')
+    tab1, tab2 = st.tabs([" Visuals", " Full Table"])
+    with tab1:
+        col1, col2 = st.columns(2)
+        with col1, timer.step("figure:top_customers"):
+            fig1 = px.bar(top_profit, x='profit', y='customer_name', orientation='h', title=" Top 10 Customers by Profit")
+            ctx.show_chart(fig1, "top_customers")
+        with col2, timer.step("figure:bottom_customers"):
+            fig2 = px.bar(bottom_profit, x='profit', y='customer_name', orientation='h', title=" Bottom 10 Customers by Profit")
+            ctx.show_chart(fig2, "bottom_customers")
+    with tab2:
+        st.dataframe(customer_sales.sort_values(by='sales', ascending=False))
+        download_table("💾 Download Customer Data", customer_sales, "customers", (filters, backend.dataset_id, filter_type, search_name))
@@ -0,0 +1,111 @@
+"""Forecast: Prophet or fast NumPy forecasts with MAPE/RMSE, and profit over time.
+
+Prophet and scikit-learn are imported by ``forecasting`` on first use.
+"""
+import streamlit as st
+
+from chart_budget import add_line, line_chart
+from forecast_jobs import ForecastQueue
+from forecasting import (
+    ENGINES, FAST_METHODS, FORECAST_FILTERS, ModelCache, batch_forecast_for, evaluate_forecast,
+    fast_forecast, load_batch_results,
+)
+from views.common import dimension_options
+
+
+@st.cache_resource
+def get_model_cache():
+    # One cache per server process, shared by every session
+    return ModelCache()
+
+@st.cache_resource
+def get_forecast_queue():
+    # Background Prophet fits, shared by every session
+    return ForecastQueue(get_model_cache())
+
+@st.cache_data(ttl=600)
+def load_batch_forecasts():
+    # Results of the nightly batch_forecast.py run, if any
+    return load_batch_results()
+
+@st.fragment(run_every=1)
+def forecast_progress(job):
+    # Only this block re-runs while the fit is in progress; the page re-runs once it is done
+    if job.done:
+        st.rerun()
+    queue = get_forecast_queue().stats()
+    st.progress(job.progress, text=f"{job.message}… {job.elapsed():.0f}s "
+                f"({queue['running']} running, {queue['queued']} queued)")
+
+
+def render(ctx):
+    backend, timer = ctx.backend, ctx.timer
+    st.markdown("<div class='section-title'> Sales Forecast with Evaluation</div>", unsafe_allow_html=True)
+    with st.expander("📌 Final Conclusion & Key Business Insights"):
+         st.markdown("""
+    After performing exploratory data analysis, building an interactive dashboard, and implementing a forecasting model, here are the major business insights derived from the Global Superstore dataset:
+
+    | **Insight Area**                        | **Observation**                                                                                              | **Recommendation**                                                                 |
+    |----------------------------------------|--------------------------------------------------------------------------------------------------------------|-------------------------------------------------------------------------------------|
+    | **1. Most Profitable Regions**         | West and East regions show higher total sales and profit. South lags behind.                                 | Focus marketing in West & East; analyze cost structures in South.                  |
+    | **2. Top Customer Segments**           | Consumer segment leads in revenue. Corporate follows.                                                        | Target Consumer segment with loyalty/upsell programs.                              |
+    | **3. Low-Profit High-Sale Products**   | Phones and Machines (Technology) show high sales but low or negative profits.                                | Reassess pricing and discounting; review supplier contracts.                       |
+    | **4. Time-Based Seasonal Trends**      | Sales peak during Nov-Dec, but profits dip due to excessive discounts.                                       | Adjust discount strategies; manage inventory for Q4 spikes.                        |
+    | **5. Forecasting & Accuracy**          | Prophet model forecasts show stable growth. MAPE = 6.56%, RMSE = $20,267.07.                                 | Rely on forecasts for strategic planning and target setting.                       |
+    | **6. Profit Alignment with Forecasts** | Profit trend follows predicted sales, indicating consistent business flow.                                   | Continue current operations but monitor deviations monthly.                        |
+    | **Final Thoughts**                     | Dashboard includes historical + predictive analysis in one place.                                            | Use it to drive strategic decisions in marketing, product mix, and logistics.      |
+    """, unsafe_allow_html=True)
+    st.markdown(" This page forecasts future sales using Prophet (or a fast NumPy engine) and evaluates the model with MAPE and RMSE. You can also see the historical sales and profit over time.", unsafe_allow_html=True)
+
+    # Filters
+    filter_type = st.selectbox(" Forecast By:", FORECAST_FILTERS)
+    value = st.selectbox(f"Select {filter_type.title()}:", options=dimension_options(filter_type, backend.version))
+    months = st.slider(" Months to Forecast:", 3, 12, 6)
+    engine = st.radio(" Forecast Engine:", ENGINES, horizontal=True,
+                      help="The fast engines fit in milliseconds; Prophet is slower but models trend changes.")
+
+    # Filter + group data
+    with timer.step("forecast_prep"):
+        ts = backend.monthly_series(filter_type, value)
+
+    # Use the nightly batch forecast when it matches the current data
+    batch = None
+    if engine == "Prophet":
+        batch = batch_forecast_for(load_batch_forecasts(), filter_type, value, ts, months)
+    if engine in FAST_METHODS:
+        with timer.step("forecast:fast"):
+            forecast = fast_forecast(ts, months, FAST_METHODS[engine])
+            mape, rmse = evaluate_forecast(ts, forecast)
+    elif batch is not None:
+        forecast, mape, rmse = batch
+    else:
+        # Fitted on a background worker (a horizon change only re-runs predict);
+        # users asking for the same forecast share one job
+        with timer.step("forecast:submit"):
+            job = get_forecast_queue().submit(filter_type, value, ts, months)
+        forecast = None
+        if not job.done:
+            forecast_progress(job)
+        elif job.error is not None:
+            st.error(f"Forecast failed: {job.error}")
+        else:
+            forecast, mape, rmse = job.result
+
+    if forecast is not None:
+        # Show metrics
+        st.metric(" MAPE (Accuracy)", f"{mape:.2f}%")
+        st.metric(" RMSE", f"${rmse:,.2f}")
+
+        # Forecast Plot
+        with timer.step("figure:forecast"):
+            fig = line_chart(forecast, 'ds', 'yhat', title=f" Forecasted Sales for {value}")
+            add_line(fig, ts, 'ds', 'y', 'Historical Sales')
+            ctx.show_chart(fig, "forecast")
+
+    # Profit over time
+    with timer.step("groupby:profit"):
+        profit_monthly = backend.monthly_series(filter_type, value, 'profit')
+        profit_monthly = profit_monthly.rename(columns={'ds': 'order_date', 'y': 'profit'})
+    with timer.step("figure:profit"):
+        fig2 = line_chart(profit_monthly, 'order_date', 'profit', title=" Profit Over Time")
+        ctx.show_chart(fig2, "profit")
@@ -0,0 +1,66 @@
+"""Home: headline KPIs with animated counters."""
+import json
+import time
+
+import streamlit as st
+from streamlit_lottie import st_lottie
+
+
+@st.cache_data
+def load_lottiefile(filepath: str):
+    with open(filepath, "r") as f:
+        return json.load(f)
+
+
+# --- Animated Counter ---
+def simple_animated_number(value, prefix="", format_type="int"):
+    placeholder = st.empty()
+    steps = 20
+    delay = 0.02
+    increment = value // steps if value > steps else 1
+    for i in range(0, value, increment):
+        formatted = f"{prefix}{i:,}" if format_type == "int" else f"{prefix}{i:,.2f}"
+        placeholder.markdown(f"### {formatted}")
+        time.sleep(delay)
+    final_value = f"{prefix}{value:,}" if format_type == "int" else f"{prefix}{value:,.2f}"
+    placeholder.markdown(f"### {final_value}")
+
+
+def render(ctx):
+    backend, filters, timer = ctx.backend, ctx.filters, ctx.timer
+    lottie_dashboard = load_lottiefile("lottie/dashboard.json")
+
+    st.markdown("<div class='section-title'>Global Superstore Dashboard</div>", unsafe_allow_html=True)
+    st.markdown(" This page gives a quick snapshot of overall performance. You can instantly see how much was sold, how much profit was earned, and how much quantity was moved across all orders.", unsafe_allow_html=True)
+    with timer.step("lottie"):
+        st_lottie(lottie_dashboard, height=250, key="dashboard")
+    st.markdown("---")
+
+    with timer.step("kpi_sums"):
+        kpis = backend.kpis(filters)
+        total_sales = int(kpis['sales'])
+        total_profit = int(kpis['profit'])
+        total_quantity = int(kpis['quantity'])
+    col1, col2, col3 = st.columns(3)
+    if "sales_ci" in kpis:
+        # Approximate mode: the estimate and its 95% interval, no count-up; the exact figures animate in
+        for col, label, measure, prefix in (
+            (col1, "**🧾 Total Sales**", "sales", "$"),
+            (col2, "**💰 Total Profit**", "profit", "$"),
+            (col3, "**📦 Total Quantity**", "quantity", ""),
+        ):
+            with col:
+                st.markdown(label)
+                st.markdown(f"### ≈ {prefix}{kpis[measure]:,.0f}")
+                st.caption(f"± {prefix}{kpis[f'{measure}_ci']:,.0f} (95% CI)")
+    else:
+        with timer.step("animated_counters"):
+            with col1:
+                st.markdown("**🧾 Total Sales**")
+                simple_animated_number(total_sales, prefix="$", format_type="float")
+            with col2:
+                st.markdown("**💰 Total Profit**")
+                simple_animated_number(total_profit, prefix="$", format_type="float")
+            with col3:
+                st.markdown("**📦 Total Quantity**")
+                simple_animated_number(total_quantity, format_type="int")
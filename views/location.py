@@ -0,0 +1,27 @@
+"""Location: sales and profit by state."""
+import plotly.express as px
+import streamlit as st
+
+from views.common import ci_columns, download_table
+
+
+def render(ctx):
+    backend, filters, timer = ctx.backend, ctx.filters, ctx.timer
+    st.markdown("<div class='section-title'> Location Performance</div>", unsafe_allow_html=True)
+    st.markdown(" This page visualizes performance by state. It tells us where we’re doing well geographically and highlights locations that may need attention.", unsafe_allow_html=True)
+
+    with timer.step("groupby"):
+        loc_summary = backend.state_summary(filters)
+        loc_summary['text'] = loc_summary['state'] + '<br>Sales: $' + loc_summary['sales'].round().astype(str)
+    tab1, tab2 = st.tabs([" Map", " State Data"])
+    with tab1, timer.step("figure:map"):
+        fig = px.scatter_geo(loc_summary, locations="state", locationmode="USA-states", scope="usa",
+                             size="sales", hover_name="state", hover_data=ci_columns(loc_summary), color="profit",
+                             title=" Sales & Profit by State")
+        ctx.show_chart(fig, "map")
+    with tab2:
+        loss_states = loc_summary.sort_values(by='profit').head(5)
+        st.warning(" Top 5 Loss-Making States")
+        st.dataframe(loss_states[['state', 'profit']])
+        st.dataframe(loc_summary.sort_values(by='sales', ascending=False))
+        download_table("💾 Download Location Data", loc_summary, "locations", (filters, backend.dataset_id))
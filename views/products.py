@@ -0,0 +1,42 @@
+"""Products: discount vs. profit heatmap and loss-making best sellers."""
+import plotly.express as px
+import streamlit as st
+
+from chart_budget import HEATMAP_ROWS, bounded_heatmap
+from query_backend import discount_pivot
+from views.common import download_table, name_index
+
+
+def render(ctx):
+    backend, filters, timer = ctx.backend, ctx.filters, ctx.timer
+    st.markdown("<div class='section-title'> Product Performance</div>", unsafe_allow_html=True)
+    st.markdown(" This page shows which products are generating high sales and profit—and flags any products with high sales but negative profit. Helps in product-level decision-making.", unsafe_allow_html=True)
+
+    cat = st.selectbox("Choose Category:", options=backend.categories(filters))
+    subcat = st.multiselect("Choose Sub-Category:", options=backend.sub_categories(filters, cat))
+    st.metric(" Avg. Discount", f"{backend.avg_discount(filters, cat, subcat):.2%}")
+    search_product = st.text_input("🔍 Search Product by Name")
+    with timer.step("groupby:products"):
+        all_products = backend.product_summary(filters, cat, subcat)
+        discount_profit = backend.product_discount_profit(filters, cat, subcat)
+    if search_product:
+        with timer.step("search"):
+            index = name_index('product_name', backend.version)
+            all_products = all_products[index.mask(all_products['product_name'], search_product)]
+            discount_profit = discount_profit[index.mask(discount_profit['product_name'], search_product)]
+    tab1, tab2 = st.tabs([" Visuals", " Full Table"])
+    with tab1:
+        with timer.step("pivot_table"):
+            pivot = discount_pivot(discount_profit)
+            heatmap = bounded_heatmap(pivot)
+        with timer.step("figure:heatmap"):
+            fig = px.imshow(heatmap, title=" Discount vs. Profit Heatmap")
+            ctx.show_chart(fig, "heatmap")
+        if len(heatmap) < len(pivot):
+            st.caption(f"Showing the {HEATMAP_ROWS} products with the largest absolute profit; the other {len(pivot) - HEATMAP_ROWS:,} are averaged into the last row.")
+        alerts = all_products[(all_products['sales'] > 5000) & (all_products['profit'] < 0)].reset_index(drop=True)
+        st.warning(f" {len(alerts)} Products have High Sales but Negative Profit")
+        st.dataframe(alerts)
+    with tab2:
+        st.dataframe(all_products.sort_values(by='sales', ascending=False))
+        download_table("💾 Download Product Data", all_products, "products", (filters, backend.dataset_id, cat, tuple(subcat), search_product))
@@ -0,0 +1,29 @@
+"""Sales: sales and profit by region and segment, monthly sales trend."""
+import plotly.express as px
+import streamlit as st
+
+from chart_budget import line_chart
+from views.common import error_bars
+
+
+def render(ctx):
+    backend, filters, timer = ctx.backend, ctx.filters, ctx.timer
+    st.markdown("<div class='section-title'> Sales Overview</div>", unsafe_allow_html=True)
+    st.markdown(" Here we dive deeper into sales and profit by region and segment. This helps us identify which markets and customer types are performing best or need attention.", unsafe_allow_html=True)
+    st.markdown("---")
+
+    with timer.step("groupby"):
+        by_region = backend.sales_by(filters, 'region', 'sales')
+        by_segment = backend.sales_by(filters, 'segment', 'profit')
+        monthly = backend.sales_by(filters, 'order_period', 'sales')
+    col1, col2 = st.columns(2)
+    with col1, timer.step("figure:sales_by_region"):
+        fig1 = px.bar(by_region, x='region', y='sales', title=' Sales by Region', color='region', **error_bars(by_region, 'sales'))
+        ctx.show_chart(fig1, "sales_by_region")
+    with col2, timer.step("figure:profit_by_segment"):
+        fig2 = px.bar(by_segment, x='segment', y='profit', title=' Profit by Segment', color='segment', **error_bars(by_segment, 'profit'))
+        ctx.show_chart(fig2, "profit_by_segment")
+
+    with timer.step("figure:monthly_sales"):
+        fig3 = line_chart(monthly, 'order_period', 'sales', title=' Monthly Sales Trend', markers=True, **error_bars(monthly, 'sales'))
+        ctx.show_chart(fig3, "monthly_sales")
@@ -0,0 +1,26 @@
+"""Shipping: sales, profit and quantity by shipping mode."""
+import plotly.express as px
+import streamlit as st
+
+from views.common import download_table, error_bars
+
+
+def render(ctx):
+    backend, filters, timer = ctx.backend, ctx.filters, ctx.timer
+    st.markdown("<div class='section-title'> Shipping Analytics</div>", unsafe_allow_html=True)
+    st.markdown(" Here, we analyze how different shipping modes impact sales, profit, and average quantity. This helps understand delivery preferences and their business impact.", unsafe_allow_html=True)
+
+    with timer.step("groupby"):
+        shipping_summary = backend.shipping_summary(filters)
+        shipping_summary['reorder_rate'] = shipping_summary['order_id'] / shipping_summary['quantity']
+    tab1, tab2 = st.tabs([" Visuals", " Shipping Data"])
+    with tab1:
+        with timer.step("figure:sales_share"):
+            fig1 = px.pie(shipping_summary, names='ship_mode', values='sales', title=' Sales Share by Shipping Mode')
+            ctx.show_chart(fig1, "sales_share")
+        with timer.step("figure:profit_by_mode"):
+            fig2 = px.bar(shipping_summary, x='ship_mode', y='profit', title=' Profit by Shipping Mode', **error_bars(shipping_summary, 'profit'))
+            ctx.show_chart(fig2, "profit_by_mode")
+    with tab2:
+        st.dataframe(shipping_summary[['ship_mode', 'quantity', 'reorder_rate']])
+        download_table("💾 Download Shipping Data", shipping_summary, "shipping", (filters, backend.dataset_id))
@@ -0,0 +1,24 @@
+"""Trends: sales by category per month, quarter or year."""
+import streamlit as st
+
+from chart_budget import line_chart
+from views.common import download_table, error_bars
+
+
+def render(ctx):
+    backend, filters, timer = ctx.backend, ctx.filters, ctx.timer
+    st.markdown("<div class='section-title'> Trend Analysis</div>", unsafe_allow_html=True)
+    st.markdown(" This section reveals trends over time—monthly, quarterly, or yearly—so we can track growth, seasonality, or dips in sales and profit across categories.", unsafe_allow_html=True)
+
+    view_by = st.radio(" View By:", ["Month", "Quarter", "Year"])
+    freq = {"Month": "M", "Quarter": "Q", "Year": "Y"}[view_by]
+    with timer.step("groupby"):
+        trends = backend.trends(filters, freq)
+
+    tab1, tab2 = st.tabs([" Sales Trends", " Full Data"])
+    with tab1, timer.step("figure:trends"):
+        fig = line_chart(trends, 'period', 'sales', color='category', title=' Sales Trends by Category', **error_bars(trends, 'sales'))
+        ctx.show_chart(fig, "trends")
+    with tab2:
+        st.dataframe(trends.sort_values(by='period'))
+        download_table("💾 Download Trend Data", trends, "trends", (filters, backend.dataset_id, freq))